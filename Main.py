@@ -4,7 +4,10 @@ import configparser
 from os import path
 from sys import argv
 
-from lib.Parser2Feed import OneRSSFile, RSSFilePerParser, RSSFilePerURL
+from lib.daemon import Daemon
+from lib.feed_server import FeedPublisher, FeedServer
+from lib.metrics import RunMetrics
+from lib.Parser2Feed import FEED_MODES
 
 
 class Main:
@@ -17,7 +20,12 @@ class Main:
         self.__config.read((default_config, user_config))
         self.__config_dict = self.__convert_config_to_dict()
 
-        self.__choose_handler()
+        if "--serve" in argv[1:]:
+            self.__serve()
+        elif "--daemon" in argv[1:]:
+            Daemon(self.__config_dict, self.__feed_modes()).run()
+        else:
+            self.__choose_handler()
 
     def __convert_config_to_dict(self):
         config_dict = {}
@@ -35,17 +43,40 @@ class Main:
 
         return config_dict
 
+    def __feed_modes(self):
+        modes = self.__config_dict["GENERAL"]["feed-mode"].split(",")
+        modes = [mode.strip() for mode in modes if mode.strip()]
+
+        for mode in modes:
+            if mode not in FEED_MODES:
+                raise NoModeError(mode, "GENERAL")
+
+        return modes
+
+    def __serve(self):
+        general = self.__config_dict["GENERAL"]
+        publisher = FeedPublisher()
+        server = FeedServer(
+            publisher,
+            general.get("serve-host", "127.0.0.1"),
+            int(general.get("serve-port", 8080)),
+        )
+        server.serve_in_background()
+
+        Daemon(self.__config_dict, self.__feed_modes(), publisher).run()
+
     def __choose_handler(self):
-        mode = self.__config_dict["GENERAL"]["feed-mode"]
-
-        if mode == "one-feed-for-all":
-            OneRSSFile(self.__config_dict)
-        elif mode == "one-feed-per-parser":
-            RSSFilePerParser(self.__config_dict)
-        elif mode == "one-feed-per-url":
-            RSSFilePerURL(self.__config_dict)
-        else:
-            raise NoModeError(mode, "GENERAL")
+        metrics = RunMetrics()
+
+        # the sections are parsed only once and shared between all modes
+        parsers = None
+        for mode in self.__feed_modes():
+            handler = FEED_MODES[mode](self.__config_dict, parsers, metrics=metrics)
+            parsers = handler.parsers
+
+        metrics_location = self.__config_dict["GENERAL"].get("metrics-location")
+        if metrics_location:
+            metrics.write(metrics_location)
 
 
 class NoModeError(Exception):
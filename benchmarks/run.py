@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""Offline benchmarks of all parsers and of AtomFeed.getFeed. The pages are
+served by a local FixtureServer, the results are printed as JSON.
+
+    python -m benchmarks.run --items 100,1000 --repeat 3 --output bench.json
+"""
+
+from datetime import datetime, timezone
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+from lib.atom_generator import AtomFeed, AtomItem
+from lib.cache import FragmentCache
+from lib.item import Item
+from lib.Parser import DescriptionFetcher, GenericParser
+from lib.site_parsers import FunkParser, IdParser, SoundcloudParser, SzParser
+
+from .server import FixtureServer, read_fixture
+
+
+def benchmarks(base_url, sizes):
+    """Yields (name, items, function); function returns the number of
+    processed entries."""
+
+    def parse(parser_class, *args):
+        return lambda: len(parser_class(*args).getData())
+
+    yield "SoundcloudParser/fixture", 3, parse(
+        SoundcloudParser, base_url + "/soundcloud/anjunadeep"
+    )
+    yield "SzParser/fixture", 3, parse(SzParser, base_url + "/sz/thema")
+    yield "IdParser/fixture", 1, parse(IdParser, base_url + "/ruthe/")
+    yield "FunkParser/fixture", 3, parse(FunkParser, "fixture")
+
+    for items in sizes:
+        yield "SoundcloudParser/synthetic", items, parse(
+            SoundcloudParser, "%s/soundcloud/synthetic?items=%s" % (base_url, items)
+        )
+        yield "SzParser/synthetic", items, parse(
+            SzParser, "%s/sz/synthetic?items=%s" % (base_url, items)
+        )
+        yield "FunkParser/synthetic", items, parse(
+            FunkParser, "synthetic-%s" % items
+        )
+        yield "AtomFeed.getFeed", items, render_feed(items, cached=False)
+        yield "AtomFeed.getFeed/cached", items, render_feed(items, cached=True)
+
+
+def render_feed(items, cached):
+    """With `cached`, the items are rendered by an earlier run already, like
+    unchanged entries of the item store."""
+    fragment_cache = FragmentCache(2**30) if cached else None
+    description = read_fixture("sz_article.html")
+    feed = AtomFeed("Benchmark", "http://example.org", "Benchmark feed")
+    for i in range(items):
+        feed.addItem(
+            Item(
+                "Nachrichten Nr. %s" % i,
+                "http://example.org/article/%s" % i,
+                description,
+                datetime(2024, 3, 1, tzinfo=timezone.utc),
+                "http://example.org",
+            )
+        )
+
+    def render():
+        old_fragment_cache = AtomItem.fragment_cache
+        AtomItem.fragment_cache = fragment_cache
+        try:
+            feed.getFeed()
+        finally:
+            AtomItem.fragment_cache = old_fragment_cache
+        return items
+
+    return render
+
+
+def measure(name, items, function, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = function()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    median = statistics.median(latencies)
+    return {
+        "name": name,
+        "items": count,
+        "expected_items": items,
+        "repeat": repeat,
+        "latency": {"min": min(latencies), "median": median, "max": max(latencies)},
+        "throughput": count / median if median else None,
+        "peak_memory": peak_memory,
+    }
+
+
+def run(sizes, repeat):
+    # every run should download and parse everything again
+    GenericParser.response_cache = None
+    DescriptionFetcher.description_cache = None
+
+    with FixtureServer() as server:
+        old_api_url = FunkParser.api_url
+        FunkParser.api_url = server.base_url + "/funk/{channel_id}/videos"
+        try:
+            results = [
+                measure(name, items, function, repeat)
+                for name, items, function in benchmarks(server.base_url, sizes)
+            ]
+        finally:
+            FunkParser.api_url = old_api_url
+
+    return {
+        "python": platform.python_version(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "--items",
+        default="100,1000",
+        help="comma separated sizes of the synthetic pages (default: %(default)s)",
+    )
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--output", help="write the JSON to this file")
+    args = arg_parser.parse_args()
+
+    sizes = [int(size) for size in args.items.split(",") if size]
+    report = json.dumps(run(sizes, args.repeat), indent=2)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+
+FIXTURE_DIR = path.join(path.dirname(path.abspath(__file__)), "fixtures")
+
+
+def read_fixture(name):
+    with open(path.join(FIXTURE_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def synthetic_soundcloud_listing(items):
+    tracks = "".join(
+        '<article class="audible"><h2 itemprop="name">'
+        '<a itemprop="url" href="/anjunadeep/track-%s">Track %s</a> by '
+        '<a href="/anjunadeep">Anjunadeep</a></h2>'
+        "<time pubdate>2024-03-01T12:%02d:%02dZ</time></article>\n"
+        % (i, i, (i // 60) % 60, i % 60)
+        for i in range(items)
+    )
+    return "<html><body><noscript>%s</noscript></body></html>" % tracks
+
+
+def synthetic_sz_listing(base, items):
+    articles = "".join(
+        '<article class="teaser"><a href="%s/sz/article/%s">'
+        '<time datetime="2024-03-01T06:%02d:%02d+01:00">1. März 2024</time>'
+        "<h3><span>SZ am Morgen</span> Nachrichten Nr. %s</h3></a></article>\n"
+        % (base, i, (i // 60) % 60, i % 60, i)
+        for i in range(items)
+    )
+    return "<html><body><div>%s</div></body></html>" % articles
+
+
+def synthetic_funk_videos(items):
+    return json.dumps(
+        {
+            "list": [
+                {
+                    "title": "Video %s" % i,
+                    "shortDescription": "Beschreibung von Video %s" % i,
+                    "alias": "video-%s" % i,
+                    "channelAlias": "kanal",
+                    "publicationDate": "2024-03-01T18:%02d:%02dZ"
+                    % ((i // 60) % 60, i % 60),
+                }
+                for i in range(items)
+            ]
+        }
+    )
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves the fixtures of FIXTURE_DIR and synthetic listing pages with
+    an arbitrary number of entries (query parameter `items`, for funk as
+    part of the channel id)."""
+
+    # keep-alive like the real sites; without Nagle's algorithm the separate
+    # writes of headers and body do not wait for delayed ACKs
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        items = int(parse_qs(url.query).get("items", ["0"])[0])
+        base = "http://%s:%s" % self.server.server_address[:2]
+
+        if url.path == "/soundcloud/anjunadeep":
+            body = read_fixture("soundcloud_listing.html")
+        elif url.path == "/soundcloud/synthetic":
+            body = synthetic_soundcloud_listing(items)
+        elif url.path.startswith("/anjunadeep/"):
+            body = read_fixture("soundcloud_track.html")
+        elif url.path == "/sz/thema":
+            body = read_fixture("sz_listing.html").replace("{{base}}", base)
+        elif url.path == "/sz/synthetic":
+            body = synthetic_sz_listing(base, items)
+        elif url.path.startswith("/sz/article/"):
+            body = read_fixture("sz_article.html")
+        elif url.path == "/ruthe/":
+            body = read_fixture("ruthe.html")
+        elif url.path == "/funk/fixture/videos":
+            body = read_fixture("funk_videos.json")
+        elif url.path.startswith("/funk/synthetic-"):
+            # /funk/synthetic-<items>/videos
+            body = synthetic_funk_videos(int(url.path.split("/")[2][10:]))
+        else:
+            self.send_error(404)
+            return
+
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            # parsers may close the connection early
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer:
+    """Local HTTP stand-in for the real sites, running in a thread."""
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        self._server.daemon_threads = True
+        # parsers may close connections early
+        self._server.handle_error = lambda request, client_address: None
+        self.base_url = "http://127.0.0.1:%s" % self._server.server_port
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -1,35 +1,111 @@
 #!/usr/bin/env python3
 
-from copy import deepcopy
-from datetime import datetime
-import urllib.request
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import threading
+import time
 import urllib.error
 import urllib.parse
-from urllib.parse import urljoin
-import json
-import re
 
 
+from html import escape
 from html.parser import HTMLParser
 
+from .http_client import HTTPClient
+from .item import Item
+
 
 class GenericParser(HTMLParser):
     """Basic tools to collect information from a single webpage (→ self._url)"""
 
-    def __init__(self, url):
+    # ResponseCache shared by all parsers, None disables caching
+    response_cache = None
+
+    # FetchRegistry of the current run, None downloads every page on its own
+    fetch_registry = None
+
+    # SeenIds of entries of earlier runs, for parsers that can stop paging
+    # early (f.e. FunkParser), None disables it
+    seen_ids = None
+
+    # keeps connections open between the requests of all parsers
+    http_client = HTTPClient()
+
+    # ProcessPoolExecutor for parsing large pages, None parses in the
+    # calling thread (see set_parse_processes)
+    parse_pool = None
+    _parse_processes = 0
+    _parse_pool_lock = threading.Lock()
+    # pages up to this size in bytes are always parsed in the calling thread
+    parse_pool_min_size = 64 * 1024
+    # bytes sent to a worker at once; the page is not downloaded further
+    # than this ahead of the parser
+    parse_pool_batch_size = 256 * 1024
+
+    def __init__(self, url, max_items=None):
         super().__init__()
         self._url = url
+        self._max_items = max_items
 
-        self.__template_item_info = {
-            "title": "",
-            "link": None,
-            "description": "",
-            "source": self._url,
-            "pubDate": None,
-        }
         self._list_url_info = []
+        self._errors = []
+        self._done = False
+        self._stats = {
+            "requests": 0,
+            "bytes": 0,
+            "status": None,  # HTTP status of self._url
+            "cache_hits": 0,
+            "shared_fetches": 0,  # pages downloaded by another parser
+            "description_cache_hits": 0,
+            "description_errors": 0,
+            "fetch_time": 0.0,  # seconds spent waiting for the network
+        }
+
+        self._act_info = Item(source=self._url)
+
+    @classmethod
+    def from_config(cls, options, max_items=None):
+        """Creates the parser out of the options of its config section."""
+        return cls(options["source-url"], max_items)
+
+    @classmethod
+    def set_parse_processes(cls, processes):
+        """Parses pages in `processes` worker processes; 0 parses them in
+        the thread that downloads them."""
+        processes = max(0, processes)
+        with GenericParser._parse_pool_lock:
+            if processes == GenericParser._parse_processes:
+                return
+
+            old_pool = GenericParser.parse_pool
+            GenericParser._parse_processes = processes
+            GenericParser.parse_pool = cls._new_parse_pool()
+
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    @classmethod
+    def _new_parse_pool(cls):
+        if GenericParser._parse_processes == 0:
+            return None
+
+        # imported only when needed, multiprocessing slows down the start
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+
+        return ProcessPoolExecutor(
+            GenericParser._parse_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
 
-        self._act_info = deepcopy(self.__template_item_info)
+    @classmethod
+    def _replace_broken_parse_pool(cls, broken_pool):
+        """A killed worker breaks the whole pool, the following pages are
+        parsed by a new one."""
+        with GenericParser._parse_pool_lock:
+            if GenericParser.parse_pool is broken_pool:
+                GenericParser.parse_pool = cls._new_parse_pool()
 
     def _attrs_to_dict(self, attrs_list):
         """Converts HTMLParser's attrs list to an dict. Thus, a check,
@@ -41,286 +117,489 @@ class GenericParser(HTMLParser):
 
         return attrs_dict
 
-    def _download_page(self):
-        request = urllib.request.Request(
-            self._url, headers={"User-Agent": "Mozilla/5.0", "Accept-Language": "en"}
-        )
-        try:
-            response = urllib.request.urlopen(request).read()
-        except (urllib.error.HTTPError, urllib.error.URLError) as error:
-            print(error, "on", self._url)
-            return ""
-        else:
-            return str(response, "utf-8")
+    def _iter_raw_page(self, chunk_size=2**14):
+        """Yields the undecoded page in chunks as soon as they are received.
+        If the generator is closed early, the connection is closed, too.
 
-    def _parse_URLs(self):
-        content = self._download_page()
-        if not content:
+        With a fetch_registry, a page that another parser is downloading
+        or has downloaded completely in this run is taken from it instead."""
+        registry = GenericParser.fetch_registry
+        if registry is None:
+            yield from self._iter_downloaded_page(chunk_size)
             return
-        self.feed(content)
-
-    def _next_url_info(self):
-        self._list_url_info.append(deepcopy(self._act_info))
-        self._act_info = deepcopy(self.__template_item_info)
-
-    def rm_whitespace(self, string_whitespace):
-        return " ".join(string_whitespace.split())
-
-    def getData(self):
-        return self._list_url_info
-
-    def handle_starttag(self, tag, attrs):
-        pass
-
-    def handle_data(self, data):
-        pass
-
-    def handle_endtag(self, tag):
-        pass
 
+        flight, download = registry.join(self._url)
+        if not download:
+            start = time.perf_counter()
+            body, error = flight.wait()
+            self._stats["fetch_time"] += time.perf_counter() - start
+
+            if body is not None or error is not None:
+                self._stats["shared_fetches"] += 1
+                if error is not None:
+                    self._report_error(error)
+                else:
+                    yield body
+                return
+
+            # the other parser stopped early
+            yield from self._iter_downloaded_page(chunk_size)
+            return
 
-class DescriptionParser:
-    """
-    Downloads url, all content of <main> can be retrieved with `getData`.
-    Helps to get a description of an feed entry.
-    """
-
-    def __init__(self, url):
-        self.page = GenericParser(url)._download_page()
-
-        re_flags = re.DOTALL | re.IGNORECASE
+        errors = len(self._errors)
+        chunks = []
+        complete = False
+        downloaded = self._iter_downloaded_page(chunk_size)
+        try:
+            for chunk in downloaded:
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            # stopped early: the rest is only downloaded for waiting parsers
+            if not complete and flight.waiters and len(self._errors) == errors:
+                chunks.extend(downloaded)
+                complete = True
+            downloaded.close()
+
+            if len(self._errors) > errors:
+                flight.finish(error=self._errors[-1])
+            elif complete:
+                flight.finish(body=b"".join(chunks))
+            else:
+                registry.abandon(self._url, flight)
+
+    def _open(self, cache):
+        """Requests the page, revalidating the page in `cache`. Returns the
+        response or None and the cached page, if it is still valid."""
+        headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "en"}
+        validators = cache.validators(self._url) if cache else {}
+        try:
+            response = GenericParser.http_client.open(
+                self._url, dict(headers, **validators)
+            )
+            return response, None
+        except urllib.error.HTTPError as error:
+            if error.code != 304 or not validators:
+                raise
+            body = cache.get(self._url)
+            if body is not None:
+                return None, body
+
+        # the cached page is gone, f.e. after a crash: ask for the page again
+        self._stats["requests"] += 1
+        return GenericParser.http_client.open(self._url, headers), None
+
+    def _iter_downloaded_page(self, chunk_size):
+        cache = GenericParser.response_cache
+
+        self._stats["requests"] += 1
+        start = time.perf_counter()
+        try:
+            response, body = self._open(cache)
+        except urllib.error.HTTPError as error:
+            self._stats["status"] = error.code
+            self._report_error(error)
+            return
+        except urllib.error.URLError as error:
+            self._report_error(error)
+            return
+        else:
+            self._stats["status"] = response.status if response else 304
+        finally:
+            self._stats["fetch_time"] += time.perf_counter() - start
 
-        matches = re.search(r"<main>.+</main>", self.page, re_flags)
-        self.page = matches.group(0)
+        if body is not None:
+            self._stats["cache_hits"] += 1
+            yield body
+            return
 
-        # Try to remove some scripts. Not secure at all.
-        self.page = re.sub(r"<script.*?</script>", "", self.page, flags=re_flags)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # only complete pages are stored in the cache
+        chunks = [] if cache and (etag or last_modified) else None
 
-    def getData(self):
-        return self.page
+        with response:
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        chunk = response.read1(chunk_size)
+                    except (http.client.HTTPException, OSError) as error:
+                        # f.e. a timeout, the page is incomplete
+                        self._report_error(error)
+                        return
+                    finally:
+                        self._stats["fetch_time"] += time.perf_counter() - start
+                    if not chunk:
+                        break
+                    if chunks is not None:
+                        chunks.append(chunk)
+                    yield chunk
+            finally:
+                self._stats["bytes"] += response.bytes_received
+
+        if chunks is not None:
+            cache.store(self._url, b"".join(chunks), etag, last_modified)
+
+    def _iter_page(self, chunk_size=2**14):
+        """Like _iter_raw_page, but yields the decoded page."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for chunk in self._iter_raw_page(chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
 
+    def _download_page(self):
+        return "".join(self._iter_page())
 
-class SoundcloudDescriptionParser(GenericParser):
-    def __init__(self, url):
-        super().__init__(url)
+    def _report_error(self, error):
+        print(error, "on", self._url)
+        self._errors.append(error)
 
-        self._inside_article = False
-        self._description_text = ""
+    def _parse_URLs(self):
+        """Feeds the page to the parser while it is downloaded. Stops the
+        download as soon as the parser is done (see _stop_parsing).
+
+        With a parse_pool, a page larger than parse_pool_min_size is parsed
+        in a worker process: batches of parse_pool_batch_size bytes are sent
+        there together with a copy of the parser, whose returned state
+        replaces the state of this parser. Between the batches, the download
+        stops like above if the parser is done."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        pool = GenericParser.parse_pool
+        received = 0
+        batch = []
+        batch_size = 0
+
+        # closed in any case, so that parsers waiting for the same page in
+        # the fetch_registry do not wait for a download that never ends
+        chunks = self._iter_raw_page()
+        try:
+            for chunk in chunks:
+                received += len(chunk)
+                if pool is None or received <= self.parse_pool_min_size:
+                    text = decoder.decode(chunk)
+                    if text:
+                        self.feed(text)
+                else:
+                    batch.append(chunk)
+                    batch_size += len(chunk)
+                    if batch_size < self.parse_pool_batch_size:
+                        continue
+
+                    self._parse_in_pool(pool, decoder.decode(b"".join(batch)))
+                    batch = []
+                    batch_size = 0
+
+                if self._done:
+                    return
+        finally:
+            chunks.close()
+
+        text = decoder.decode(b"".join(batch), final=True)
+        if batch:
+            self._parse_in_pool(pool, text)
+        elif text:
+            self.feed(text)
+
+    def _parse_in_pool(self, pool, text):
+        from concurrent.futures.process import BrokenProcessPool
 
-        self._parse_URLs()
+        try:
+            parsed = pool.submit(_parse_page, self, text).result()
+        except BrokenProcessPool:
+            self._replace_broken_parse_pool(pool)
+            raise
+        self.__dict__.update(parsed.__dict__)
 
-    def getData(self):
-        return self._description_text
+    def _stop_parsing(self):
+        """Signals that the parser does not need the rest of the page."""
+        self._done = True
 
-    def handle_starttag(self, tag, attrs):
-        if tag == "article":
-            self._inside_article = True
+    def _next_url_info(self):
+        if self._done:
             return
 
-        if tag == "meta" and self._inside_article:
-            attrs = self._attrs_to_dict(attrs)
-            if (
-                "itemprop" in attrs
-                and attrs["itemprop"] == "description"
-                and "content" in attrs
-            ):
-                self._description_text = attrs["content"]
-
-    def handle_endtag(self, tag):
-        if tag == "article" and self._inside_article:
-            self._inside_article = False
-
+        self._list_url_info.append(self._act_info)
+        self._act_info = Item(source=self._url)
 
-class SoundcloudParser(GenericParser):
-    def __init__(self, url):
-        super().__init__(url)
+        if self._max_items and len(self._list_url_info) >= self._max_items:
+            self._stop_parsing()
 
-        self._found_track = False
+    def _fetch_descriptions(self, description_parser):
+        """Fills the description of all collected entries with the data that
+        `description_parser` retrieves from the entry links."""
+        links = [elem.link for elem in self._list_url_info]
+        fetcher = DescriptionFetcher(description_parser)
+        descriptions = fetcher.fetch(links)
 
-        self._collect_pubdate = False
-        self._pubdate_string = ""
+        for elem, description in zip(self._list_url_info, descriptions):
+            elem.description = description
 
-        self._collect_title = False
-        self._title_string = ""
+        # failed descriptions do not make the whole page fail
+        for key, value in fetcher.getStats().items():
+            self._stats[key] += value
 
-        self._parse_URLs()
-
-        for elem in self._list_url_info:
-            parser = SoundcloudDescriptionParser(elem["link"])
-            elem["description"] = parser.getData()
+    def rm_whitespace(self, string_whitespace):
+        return " ".join(string_whitespace.split())
 
-    def __str__(self):
-        return "Soundcloud"
+    def getData(self):
+        return self._list_url_info
 
-    def _next_url_info(self):
-        GenericParser._next_url_info(self)
+    def getErrors(self):
+        """Errors that occurred while downloading or parsing self._url"""
+        return self._errors
 
-        self._pubdate_string = ""
-        self._title_string = ""
+    def getStats(self):
+        """Number of requests, downloaded bytes, etc. of self._url and
+        all fetched descriptions"""
+        return self._stats
 
     def handle_starttag(self, tag, attrs):
-        attrs = self._attrs_to_dict(attrs)
-
-        if tag == "article" and "class" in attrs and attrs["class"] == "audible":
-            self._found_track = True
-
-        if self._found_track:
-            if tag == "a" and "itemprop" in attrs and attrs["itemprop"] == "url":
-                self._act_info["link"] = urljoin(self._url, attrs["href"])
-                self._collect_title = True
-
-            if tag == "time" and "pubdate" in attrs:
-                self._collect_pubdate = True
+        pass
 
     def handle_data(self, data):
-        if self._collect_pubdate:
-            self._pubdate_string += data
-
-        if self._collect_title:
-            self._title_string += data
+        pass
 
     def handle_endtag(self, tag):
-        if tag == "article" and self._found_track:
-            self._found_track = False
-            self._next_url_info()
-
-        if tag == "a" and self._collect_title:
-            self._act_info["title"] = self.rm_whitespace(self._title_string)
-            self._collect_title = False
-
-        if tag == "time" and self._collect_pubdate:
-            self._collect_pubdate = False
-
-            try:
-                self._act_info["pubDate"] = datetime.fromisoformat(
-                    # strip last Z
-                    self._pubdate_string[:-1]
-                )
-            except ValueError as e:
-                self._act_info["pubDate"] = datetime.strptime(
-                    self._pubdate_string, "%Y/%m/%d  %H:%M:%S%z"
-                )
+        pass
 
 
-class IdParser(GenericParser):
-    def __init__(self, url):
-        super().__init__(url)
+class MissingOptionError(ValueError):
+    """A config section lacks an option its parser needs. The section is
+    filled in by ParserRunner."""
 
-        self._id_found = False
+    def __init__(self, option, config_section=None):
+        self.option = option
+        self.config_section = config_section
 
-        self._tag = "a"
-        self._id = "link_archive"
+    def __str__(self):
+        return repr(
+            'The configsection "%s" needs the option "%s".'
+            % (self.config_section, self.option)
+        )
 
-        self._parse_URLs()
 
-    def __str__(self):
-        return "ID"
+def _parse_page(parser, text):
+    """Runs in a worker process of GenericParser.parse_pool. Returns the
+    parser with the collected entries."""
+    parser.feed(text)
+    return parser
 
-    def handle_starttag(self, tag, attrs):
-        if tag == self._tag:
-            attrs = self._attrs_to_dict(attrs)
-            if attrs.get("id") == self._id:
-                self._id_found = True
-
-                link = urljoin(self._url, attrs["href"])
-                self._act_info["link"] = link
-                self._act_info["pubDate"] = datetime.now()
-        elif tag == "img" and self._id_found:
-            attrs = self._attrs_to_dict(attrs)
-            src = urljoin(self._url, attrs["src"])
-            self._act_info["description"] = f'<img src="{ src }" />'
 
-    def handle_endtag(self, tag):
-        if tag == self._tag and self._id_found:
-            self._id_found = False
-            self._next_url_info()
+class DescriptionParser(GenericParser):
+    """
+    Downloads url, all content of <main> can be retrieved with `getData`.
+    Helps to get a description of an feed entry. Scripts and styles are
+    dropped and at most `max_size` bytes of <main> are kept.
+    """
 
+    max_size = 512 * 1024
+
+    # elements without end tag
+    VOID_TAGS = {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
 
-class SzParser(GenericParser):
     def __init__(self, url):
         super().__init__(url)
 
-        self.__found_entry = False
-        self.__inside_style = False
-        self.__inside_heading = False
+        self._open_tags = []  # open tags inside <main>
+        self._skip_tag = None  # script or style tag whose content is dropped
+        self._parts = []
+        self._size = 0
 
         self._parse_URLs()
 
-        for elem in self._list_url_info:
-            parser = DescriptionParser(elem["link"])
-            elem["description"] = parser.getData()
+    def getData(self):
+        return "".join(self._parts)
 
-    def __str__(self):
-        return "SZ"
+    def _append(self, text):
+        self._parts.append(text)
+        self._size += len(text.encode("utf-8"))
 
-    def handle_starttag(self, tag, attrs):
-        if tag == "article":
-            self.__found_entry = True
- 
-        if self.__found_entry and tag == "a":
-            attrs = self._attrs_to_dict(attrs)
-            self._act_info["link"] = attrs["href"]
+        if self._size > self.max_size:
+            self._close_main()
 
-        if self.__found_entry and tag == "time":
-            attrs = self._attrs_to_dict(attrs)
-            self._act_info["pubDate"] = datetime.fromisoformat(attrs.get("datetime"))
+    def _close_main(self):
+        while self._open_tags:
+            self._parts.append("</%s>" % self._open_tags.pop())
+        self._stop_parsing()
 
-        if tag == "style":
-            self.__inside_style = True
+    def handle_starttag(self, tag, attrs):
+        if self._done or self._skip_tag:
+            return
 
-        if tag == "h3":
-            self.__inside_heading = True
+        if not self._open_tags:
+            if tag != "main":
+                return
+        elif tag in ("script", "style"):
+            self._skip_tag = tag
+            return
+
+        if tag not in self.VOID_TAGS:
+            self._open_tags.append(tag)
+        self._append(self.get_starttag_text())
 
     def handle_data(self, data):
-        if self.__found_entry and self.__inside_heading and not self.__inside_style:
-            self._act_info["title"] += data
+        if self._open_tags and not self._skip_tag and not self._done:
+            self._append(escape(data, quote=False))
 
     def handle_endtag(self, tag):
-        if tag == "article" and self.__found_entry:
-            self.__found_entry = False
-
-            self._act_info["title"] = self.rm_whitespace(self._act_info["title"])
-
-            self._next_url_info()
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_tag = None
+            return
 
-        if tag == "style":
-            self.__inside_style = False
+        if self._done or tag not in self._open_tags:
+            return
 
-        if tag == "h3" and self.__inside_heading:
-            self.__inside_heading = False
+        # close unclosed elements, too
+        while self._open_tags:
+            open_tag = self._open_tags.pop()
+            self._append("</%s>" % open_tag)
+            if open_tag == tag:
+                break
+
+        if not self._open_tags:
+            self._stop_parsing()
+
+
+class DescriptionFetcher:
+    """Downloads the descriptions of several feed entries at once with the
+    given description parser. The number of parallel requests to a single
+    host is limited by `max_per_host`, also across concurrent fetchers.
+    Descriptions found in `description_cache` or `run_descriptions` are not
+    downloaded again."""
+
+    max_per_host = 4
+
+    # DescriptionCache shared by all fetchers, None disables caching
+    description_cache = None
+
+    # descriptions fetched during the current run, set by ParserRunner.run;
+    # unlike the fetch_registry it keeps pages the parser stopped early
+    # template: {(description parser, 'link'): 'description'}
+    run_descriptions = None
+
+    _host_semaphores = {}
+    _lock = threading.Lock()
+
+    def __init__(self, description_parser):
+        self._description_parser = description_parser
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "bytes": 0,
+            "cache_hits": 0,
+            "shared_fetches": 0,
+            "description_cache_hits": 0,
+            "description_errors": 0,
+            "fetch_time": 0.0,
+        }
 
-class FunkParser(GenericParser):
-    def __init__(self, channel_id):
-        self.channel_id = channel_id
-        url = f"https://www.funk.net/api/frontend/webapp/video-channels/{channel_id}/videos?page=0&size=10"
-        super().__init__(url)
+    @classmethod
+    def set_max_per_host(cls, max_per_host):
+        with cls._lock:
+            cls.max_per_host = max(1, max_per_host)
+            cls._host_semaphores = {}
+
+    @classmethod
+    def _host_semaphore(cls, host):
+        with cls._lock:
+            if host not in cls._host_semaphores:
+                cls._host_semaphores[host] = threading.BoundedSemaphore(
+                    cls.max_per_host
+                )
+            return cls._host_semaphores[host]
+
+    def _fetch_one(self, link):
+        with self._host_semaphore(urllib.parse.urlsplit(link).netloc):
+            parser = self._description_parser(link)
+            description = parser.getData()
+
+        errors = parser.getErrors()
+        with self._stats_lock:
+            for key, value in parser.getStats().items():
+                if key in self._stats:
+                    self._stats[key] += value
+            self._stats["description_errors"] += len(errors)
+
+        # f.e. after a timeout, the description may be incomplete
+        if errors:
+            return description
+
+        if self.run_descriptions is not None:
+            self.run_descriptions[(self._description_parser, link)] = description
+        if self.description_cache:
+            self.description_cache.store(link, description)
+        return description
+
+    def fetch(self, links):
+        """Returns the descriptions in the same order as `links`."""
+        descriptions = {}
+        for link in links:
+            if link in descriptions:
+                continue
+
+            if self.run_descriptions is not None:
+                key = (self._description_parser, link)
+                description = self.run_descriptions.get(key)
+                if description is not None:
+                    descriptions[link] = description
+                    self._stats["shared_fetches"] += 1
+                    continue
+
+            if self.description_cache:
+                description = self.description_cache.get(link)
+                if description is not None:
+                    descriptions[link] = description
+                    self._stats["description_cache_hits"] += 1
+
+        missing = list(dict.fromkeys(l for l in links if l not in descriptions))
+        if missing:
+            hosts = {urllib.parse.urlsplit(link).netloc for link in missing}
+            max_workers = min(len(missing), len(hosts) * self.max_per_host)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                descriptions.update(
+                    zip(missing, executor.map(self._fetch_one, missing))
+                )
 
-        self.json_response = self._download_page()
-        self.handle_json()
+        return [descriptions[link] for link in links]
 
-    def __str__(self):
-        return "Funk"
+    def getStats(self):
+        return self._stats
 
-    def handle_json(self):
-        try:
-            python_struct = json.loads(self.json_response)
-        except json.decoder.JSONDecodeError as error:
-            print(error, "on", self._url)
-            return
 
-        for element in python_struct["list"]:
-            self._act_info["title"] = element["title"]
-            self._act_info["description"] = element["shortDescription"]
+SITE_PARSERS = (
+    "FunkParser",
+    "IdParser",
+    "SoundcloudDescriptionParser",
+    "SoundcloudParser",
+    "SzParser",
+)
 
-            video_alias = element["alias"]
-            channel_alias = element["channelAlias"]
-            link = f"https://www.funk.net/channel/{channel_alias}/{video_alias}"
-            self._act_info["link"] = link
 
-            # f.e. '2022-10-20T18:00:00Z'
-            pubdate = datetime.strptime(
-                element["publicationDate"], "%Y-%m-%dT%H:%M:%S%z"
-            )
-            self._act_info["pubDate"] = pubdate
+def __getattr__(name):
+    """The site parsers moved to lib.site_parsers, which is imported only
+    when they are used."""
+    if name in SITE_PARSERS:
+        from . import site_parsers
 
-            self._next_url_info()
+        return getattr(site_parsers, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,136 +1,400 @@
 #!/usr/bin/env python3
 
-from os import path, mkdir
+from concurrent.futures import ThreadPoolExecutor
+from os import path, makedirs, replace
+import json
+import time
 
 from .atom_generator import AtomFeed
-from .Parser import IdParser, SoundcloudParser, SzParser, FunkParser
+from .cache import DescriptionCache, ResponseCache, SeenIds
+from .fetch_registry import FetchRegistry
+from .item_store import ItemStore
+from .metrics import RunMetrics
+from .registry import registry
+from .section_state import SectionState
+from .Parser import (
+    DescriptionFetcher,
+    DescriptionParser,
+    GenericParser,
+    MissingOptionError,
+)
+
+# sidecar file in feed-location with the content hashes of the written feeds
+FEED_HASH_FILE = ".feed-hashes.json"
+
+
+class ParserRunner:
+    """Downloads and parses config sections concurrently. The caches are
+    created once per runner and saved after every run. Timings etc. of
+    every section are recorded in `metrics` (RunMetrics). Pages that
+    several sections need are downloaded once per run (see FetchRegistry).
+
+    Sections that are not started before the run deadline and sections
+    with an open circuit breaker (see SectionState) are skipped. Skipped
+    and failed sections keep the entries of their last successful run."""
+
+    def __init__(self, config, metrics=None):
+        self._config = config
+        self.metrics = metrics if metrics is not None else RunMetrics()
+
+        max_per_host = int(self._config["GENERAL"].get("max-requests-per-host", 4))
+        DescriptionFetcher.set_max_per_host(max_per_host)
+        GenericParser.http_client.max_idle_per_host = max_per_host
+        DescriptionParser.max_size = (
+            int(self._config["GENERAL"].get("description-max-size", 512)) * 1024
+        )
+        GenericParser.http_client.connect_timeout = float(
+            self._config["GENERAL"].get("connect-timeout", 10)
+        )
+        GenericParser.http_client.read_timeout = float(
+            self._config["GENERAL"].get("read-timeout", 30)
+        )
+        GenericParser.set_parse_processes(
+            int(self._config["GENERAL"].get("parse-processes", 0))
+        )
+        self._deadline = None
+
+        self._setup_caches()
+        self._item_store = open_item_store(self._config)
+
+    def close(self):
+        """Closes the item store, f.e. when the daemon stops."""
+        if self._item_store:
+            self._item_store.close()
+            self._item_store = None
+
+    def _setup_caches(self):
+        cache_location = self._config["GENERAL"].get("cache-location")
+
+        if cache_location:
+            GenericParser.response_cache = ResponseCache(
+                cache_location,
+                int(self._config["GENERAL"].get("cache-max-size", 50)) * 1024**2,
+            )
+            DescriptionFetcher.description_cache = DescriptionCache(
+                path.join(cache_location, "descriptions.json"),
+                int(self._config["GENERAL"].get("description-cache-ttl", 30)) * 86400,
+                int(self._config["GENERAL"].get("description-cache-max-size", 20))
+                * 1024**2,
+            )
+            GenericParser.seen_ids = SeenIds(path.join(cache_location, "seen.json"))
+        else:
+            GenericParser.response_cache = None
+            DescriptionFetcher.description_cache = None
+            GenericParser.seen_ids = None
+
+        self._state = SectionState(
+            path.join(cache_location, "sections.json") if cache_location else None,
+            int(self._config["GENERAL"].get("circuit-breaker-failures", 3)),
+            float(self._config["GENERAL"].get("circuit-breaker-cooldown", 360)) * 60,
+            DescriptionFetcher.description_cache,
+        )
+
+    def _save_caches(self):
+        self._state.save()
+        if GenericParser.response_cache:
+            GenericParser.response_cache.save()
+        if DescriptionFetcher.description_cache:
+            DescriptionFetcher.description_cache.save()
+        if GenericParser.seen_ids:
+            GenericParser.seen_ids.save()
+
+    def run(self, sections):
+        """Runs the parsers of `sections`. Returns a dict
+        {'Section': Parser-object} in the order of `sections` and a set of
+        failed or skipped sections. A section whose parser raises is
+        reported and left out of the dict, unless entries of an earlier run
+        are known."""
+        max_workers = int(self._config["GENERAL"].get("max-workers", 8))
+
+        run_deadline = float(self._config["GENERAL"].get("run-deadline", 0))
+        self._deadline = time.monotonic() + run_deadline if run_deadline else None
+
+        # every URL is downloaded only once per run
+        GenericParser.fetch_registry = FetchRegistry()
+        DescriptionFetcher.run_descriptions = {}
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = [
+                    (section, executor.submit(self._run_parser, section))
+                    for section in sections
+                ]
+        finally:
+            GenericParser.fetch_registry = None
+            DescriptionFetcher.run_descriptions = None
+
+        parsers = {}
+        failed = set()
+        for section, future in futures:
+            try:
+                parser = future.result()
+            except (NoParserError, MissingOptionError):
+                # configuration errors are not failures of the section
+                raise
+            except SectionSkipped as error:
+                print(error, "on", section)
+                parser = None
+            except Exception as error:
+                print(error, "on", section)
+                self._state.record_failure(section)
+                parser = None
+            else:
+                if parser.getErrors():
+                    self._state.record_failure(section)
+                else:
+                    self._state.record_success(section, parser)
+                    if self._item_store:
+                        self._item_store.merge(section, parser.getData())
+                    parsers[section] = parser
+                    continue
+
+            failed.add(section)
+            parser = self._state.last_parser(section) or parser
+            if parser is not None:
+                parsers[section] = parser
+
+        self._save_caches()
+
+        return parsers, failed
+
+    def _run_parser(self, section):
+        start = time.perf_counter()
+        try:
+            if self._deadline is not None and time.monotonic() > self._deadline:
+                raise SectionSkipped("skipped, run deadline exceeded")
+            if self._state.is_open(section):
+                raise SectionSkipped("skipped, failed too often")
+
+            parser = self._choose_parser(section)
+        except Exception as error:
+            self.metrics.record_section(
+                section, None, time.perf_counter() - start, error
+            )
+            raise
+
+        self.metrics.record_section(section, parser, time.perf_counter() - start)
+        return parser
+
+    def _choose_parser(self, config_section):
+        config_parser = self._config[config_section]["parser"]
+        max_items = int(self._config[config_section].get("max-items", 0)) or None
+
+        try:
+            parser_class = registry.get(config_parser)
+        except KeyError:
+            raise NoParserError(config_parser, config_section) from None
+
+        try:
+            return parser_class.from_config(self._config[config_section], max_items)
+        except MissingOptionError as error:
+            error.config_section = config_section
+            raise
 
 
 class GenericParser2FeedHandler:
-    def __init__(self, config):
+    """Creates and writes feeds out of all config sections. If `parsers`
+    (f.e. of another handler) are passed, the sections are not downloaded
+    and parsed again. If `changed_sections` are passed, only feeds that
+    contain one of them are written. Timings etc. are recorded in
+    `metrics` (RunMetrics). With a `publisher` (FeedPublisher), the feeds
+    are published in memory instead of written to feed-location."""
+
+    def __init__(
+        self,
+        config,
+        parsers=None,
+        changed_sections=None,
+        metrics=None,
+        publisher=None,
+    ):
         self._config = config
+        self._changed_sections = changed_sections
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        self._publisher = publisher
 
         self._feed_dict = {}  # template: {'Filename': AtomFeed-object}
 
-        self._create_feed()
-        self.__write_feed_2_file()
+        if parsers is None:
+            runner = ParserRunner(self._config, self.metrics)
+            try:
+                parsers, _ = runner.run(self._sections())
+            finally:
+                runner.close()
+
+        self._parsers = parsers  # template: {'Section': Parser-object}
+
+        # with an item store, feeds contain the entries of earlier runs, too
+        self._item_store = open_item_store(self._config)
+        try:
+            self._create_feed()
+        finally:
+            if self._item_store:
+                self._item_store.close()
+
+        if self._publisher is not None:
+            self.__publish_feeds()
+        else:
+            self.__write_feed_2_file()
+
+    @property
+    def parsers(self):
+        return self._parsers
 
     def __write_feed_2_file(self):
+        """Writes all feeds atomically. Feeds whose content did not change
+        since the last run (see FEED_HASH_FILE) are not written again."""
+        hash_file = path.join(
+            path.expanduser(self._config["GENERAL"]["feed-location"]),
+            FEED_HASH_FILE,
+        )
+        try:
+            with open(hash_file) as f:
+                feed_hashes = json.load(f)
+        except (OSError, ValueError):
+            feed_hashes = {}
+
         for feed_path, feed_object in list(self._feed_dict.items()):
             feed_object.sort_items_after_date()
 
             # check directory
             feed_path = path.expanduser(feed_path)
             dir_path = path.dirname(feed_path)
-            if not path.exists(dir_path):
-                mkdir(dir_path)
+            makedirs(dir_path, exist_ok=True)
 
-            with open(feed_path, "w") as f:
-                f.write(feed_object.getFeed())
+            start = time.perf_counter()
+            content_hash = feed_object.contentHash()
+            render_time = time.perf_counter() - start
+
+            if feed_hashes.get(feed_path) == content_hash and path.exists(feed_path):
+                self.metrics.record_feed(
+                    feed_path, render_time, 0.0, len(feed_object.itemlist), False
+                )
+                continue
+
+            start = time.perf_counter()
+            tmp_path = feed_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8", buffering=2**16) as f:
+                feed_object.writeFeed(f)
+            replace(tmp_path, feed_path)
+
+            feed_hashes[feed_path] = content_hash
+            self.metrics.record_feed(
+                feed_path,
+                render_time,
+                time.perf_counter() - start,
+                len(feed_object.itemlist),
+                True,
+            )
+
+        if self._feed_dict:
+            with open(hash_file + ".tmp", "w") as f:
+                json.dump(feed_hashes, f)
+            replace(hash_file + ".tmp", hash_file)
+
+    def __publish_feeds(self):
+        """Renders the feeds whose content changed into the publisher."""
+        for feed_path, feed_object in self._feed_dict.items():
+            feed_object.sort_items_after_date()
+            name = path.basename(feed_path)
+
+            start = time.perf_counter()
+            content_hash = feed_object.contentHash()
+            render_time = time.perf_counter() - start
+
+            changed = self._publisher.content_hash(name) != content_hash
+            start = time.perf_counter()
+            if changed:
+                self._publisher.publish(name, feed_object, content_hash)
+
+            self.metrics.record_feed(
+                feed_path,
+                render_time,
+                time.perf_counter() - start,
+                len(feed_object.itemlist),
+                changed,
+            )
 
     def _create_feed(self):
         pass
 
-    def _choose_parser(self, config_section):
-        config_parser = self._config[config_section]["parser"]
-
-        if config_parser == "funk":
-            return FunkParser(self._config[config_section]["channel-id"])
-        elif config_parser == "idparser":
-            return IdParser(self._config[config_section]["source-url"])
-        elif config_parser == "soundcloud":
-            return SoundcloudParser(self._config[config_section]["source-url"])
-        elif config_parser == "szparser":
-            return SzParser(self._config[config_section]["source-url"])
-        else:
-            raise NoParserError(config_parser, config_section)
+    def _sections(self):
+        return [i for i in self._config if i != "GENERAL"]
 
+    def _add_feed(self, filename, sections):
+        """Adds a feed with the entries of all `sections` to the feeds that
+        will be written."""
+        if self._changed_sections is not None and not set(sections).intersection(
+            self._changed_sections
+        ):
+            return
 
-class OneRSSFile(GenericParser2FeedHandler):
-    def _create_feed(self):
+        max_items = int(self._config["GENERAL"].get("max-items", 0)) or None
         feed = AtomFeed(
             self._config["GENERAL"]["feed-title"],
             self._config["GENERAL"]["feed-url"],
             self._config["GENERAL"]["feed-description"],
+            max_items=max_items,
         )
 
-        for i in self._config:
-            if i != "GENERAL":
-                parser = self._choose_parser(i)
+        if self._item_store:
+            if max_items is None:
+                max_items = int(self._config["GENERAL"].get("retention-max-items", 0))
+            for item in self._item_store.items(sections, max_items or None):
+                feed.addItem(item)
+        else:
+            feed.addRuns(
+                self._parsers[section].getData()
+                for section in sections
+                if section in self._parsers
+            )
 
-                for d in parser.getData():
-                    feed.addItem(
-                        d["title"],
-                        d["link"],
-                        d["description"],
-                        d["pubDate"],
-                        d["source"],
-                    )
+        feed_location = self._config["GENERAL"]["feed-location"]
+        self._feed_dict[path.join(feed_location, filename)] = feed
 
-                feed_location = self._config["GENERAL"]["feed-location"]
-                self._feed_dict[path.join(feed_location, "feed.xml")] = feed
+
+class OneRSSFile(GenericParser2FeedHandler):
+    def _create_feed(self):
+        if self._sections():
+            self._add_feed("feed.xml", self._sections())
 
 
 class RSSFilePerParser(GenericParser2FeedHandler):
     def _create_feed(self):
-        parser_dict = {}
+        parser_dict = {}  # template: {'Parsername': [sections]}
 
-        for i in self._config:
-            if i != "GENERAL":
-                parser = self._choose_parser(i)
-                parser_name = str(parser)
-
-                if parser_name in list(parser_dict.keys()):
-                    parser_dict[parser_name].append(parser)
-                else:
-                    parser_dict[parser_name] = [parser]
+        for section, parser in self._parsers.items():
+            parser_dict.setdefault(str(parser), []).append(section)
 
         for i in parser_dict:
-            feed = AtomFeed(
-                self._config["GENERAL"]["feed-title"],
-                self._config["GENERAL"]["feed-url"],
-                self._config["GENERAL"]["feed-description"],
-            )
-
-            for p in parser_dict[i]:
-                for d in p.getData():
-                    feed.addItem(
-                        d["title"],
-                        d["link"],
-                        d["description"],
-                        d["pubDate"],
-                        d["source"],
-                    )
-
-            feed_location = self._config["GENERAL"]["feed-location"]
-            full_path = path.join(feed_location, "feed-%s.xml" % i)
-            self._feed_dict[full_path] = feed
+            self._add_feed("feed-%s.xml" % i, parser_dict[i])
 
 
 class RSSFilePerURL(GenericParser2FeedHandler):
     def _create_feed(self):
-        for i in self._config:
-            if i != "GENERAL":
-                feed = AtomFeed(
-                    self._config["GENERAL"]["feed-title"],
-                    self._config["GENERAL"]["feed-url"],
-                    self._config["GENERAL"]["feed-description"],
-                )
+        for i in self._parsers:
+            self._add_feed("feed-%s.xml" % i, [i])
+
+
+FEED_MODES = {
+    "one-feed-for-all": OneRSSFile,
+    "one-feed-per-parser": RSSFilePerParser,
+    "one-feed-per-url": RSSFilePerURL,
+}
+
+
+def open_item_store(config):
+    """ItemStore configured in GENERAL or None, if it is disabled."""
+    file_path = config["GENERAL"].get("item-store")
+    if not file_path:
+        return None
 
-                parser = self._choose_parser(i)
+    max_age = float(config["GENERAL"].get("retention-days", 0)) * 86400
+    max_items = int(config["GENERAL"].get("retention-max-items", 0))
+    return ItemStore(file_path, max_age or None, max_items or None)
 
-                for d in parser.getData():
-                    feed.addItem(
-                        d["title"],
-                        d["link"],
-                        d["description"],
-                        d["pubDate"],
-                        d["source"],
-                    )
 
-                feed_location = self._config["GENERAL"]["feed-location"]
-                full_path = path.join(feed_location, "feed-%s.xml" % i)
-                self._feed_dict[full_path] = feed
+class SectionSkipped(Exception):
+    pass
 
 
 class NoParserError(Exception):
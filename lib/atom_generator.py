@@ -1,64 +1,119 @@
 #!/usr/bin/env python3
 
 from email.utils import formatdate
-import time
-from operator import attrgetter
+from hashlib import sha256
+from itertools import islice
+import heapq
+
+from .cache import FragmentCache
+from .dates import format_rfc822
+from .item import Item
 
 # RSS-reference → http://www.w3schools.com/rss/rss_reference.asp
 
+INFO_TEMPLATE = """        <title>%s</title>
+        <link>%s</link>
+        <description>%s</description>"""
+
+
+def escape(text):
+    """see http://www.w3.org/TR/REC-xml/#dt-chardata and
+    http://www.w3.org/TR/REC-xml/#dt-escape
+
+    Each str.replace is a single C-level scan and returns the string itself
+    if there is nothing to replace, which is faster than str.translate with
+    a multi-character table."""
+    return text.replace("&", "&#38;").replace("<", "&#60;").replace(">", "&#62;")
+
+
+def date_key(item):
+    """Sort key for newest first (reverse=True) of Items and AtomItems. Naive
+    pubDates are local time, like in the rendered feed. Entries without
+    pubDate come after all others."""
+    if item.pubDate is None:
+        return float("-inf")
+    return item.pubDate.timestamp()
+
 
 class AtomFeed:
-    def __init__(self, *args):
+    """The feed keeps at most `max_items` entries, the newest ones, if they
+    are sorted by sort_items_after_date or added by addRuns."""
+
+    def __init__(self, *args, max_items=None):
         self.channel = AtomChannel(*args)
         self.itemlist = []
+        self.max_items = max_items
 
     def addItem(self, *args):
-        self.itemlist.append(AtomItem(*args))
+        """Takes either a single Item or title, link, description[, pubDate[,
+        source]]."""
+        if len(args) == 1 and isinstance(args[0], Item):
+            self.itemlist.append(AtomItem.fromItem(args[0]))
+        else:
+            self.itemlist.append(AtomItem(*args))
 
-    def sort_items_after_date(self):
-        self.itemlist.sort(key=attrgetter("pubDate"), reverse=True)
+    def addRuns(self, runs):
+        """Adds the newest items out of several runs of Items (f.e. the
+        entries of every parser). Each run is sorted on its own, which is
+        linear for runs that are already ordered, and the runs are merged
+        with a heap, so only the first `max_items` items are added."""
+        runs = [sorted(run, key=date_key, reverse=True) for run in runs]
+        merged = heapq.merge(*runs, key=date_key, reverse=True)
 
-    def getFeed(self):
-        feed = """<?xml version="1.0" encoding="UTF-8" ?>
+        for item in islice(merged, self.max_items):
+            self.addItem(item)
+
+    def sort_items_after_date(self):
+        self.itemlist.sort(key=date_key, reverse=True)
+        if self.max_items is not None:
+            del self.itemlist[self.max_items :]
+
+    def iterFeed(self):
+        """Yields the feed piece by piece, so that only a single item has to
+        be rendered at a time."""
+        yield """<?xml version="1.0" encoding="UTF-8" ?>
 <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
 """
-        feed += "\n<channel>\n"
-        feed += self.channel.getInfo()
+        yield "\n<channel>\n"
+        yield self.channel.getInfo()
 
         for i in self.itemlist:
-            feed += i.getItem()
+            yield i.getItem()
+
+        yield "\n</channel>\n\n</rss>"
 
-        feed += "\n</channel>\n\n</rss>"
+    def getFeed(self):
+        return "".join(self.iterFeed())
 
-        return feed
+    def contentHash(self):
+        """Hash over channel info and items, without the changing pubDate of
+        the channel. Items are not rendered for it, see AtomItem.key."""
+        content_hash = sha256(AtomBaseItem.getInfo(self.channel).encode("utf-8"))
+        for i in self.itemlist:
+            content_hash.update(i.key())
 
+        return content_hash.hexdigest()
+
+    def writeFeed(self, file):
+        for chunk in self.iterFeed():
+            file.write(chunk)
 
-class AtomBaseItem:
-    def __init__(self, title, link, description):
-        self.title = self.__escape_entities(title)
-        self.link = self.__escape_entities(link)
-        self.description = self.__escape_entities(description)
 
-    def __escape_entities(self, text):
-        """see http://www.w3.org/TR/REC-xml/#dt-chardata and
-        http://www.w3.org/TR/REC-xml/#dt-escape"""
-        text = text.replace("&", "&#38;")
-        text = text.replace("<", "&#60;")
-        text = text.replace(">", "&#62;")
+class AtomBaseItem:
+    __slots__ = ("title", "link", "description")
 
-        return text
+    def __init__(self, title, link, description):
+        self.title = escape(title)
+        self.link = escape(link)
+        self.description = escape(description)
 
     def getInfo(self):
-        return """        <title>%s</title>
-        <link>%s</link>
-        <description>%s</description>""" % (
-            self.title,
-            self.link,
-            self.description,
-        )
+        return INFO_TEMPLATE % (self.title, self.link, self.description)
 
 
 class AtomChannel(AtomBaseItem):
+    __slots__ = ("url",)
+
     def __init__(self, title, link, description):
         super().__init__(title, link, description)
         self.url = link
@@ -76,18 +131,29 @@ class AtomChannel(AtomBaseItem):
 
 
 class AtomItem(AtomBaseItem):
+    """Unlike the channel, the fields are kept unescaped and the item is only
+    escaped and rendered if its fragment is not cached yet."""
+
+    __slots__ = ("pubDate", "__source", "__key")
+
+    # FragmentCache of rendered items shared by all feeds, None disables it
+    fragment_cache = FragmentCache(16 * 1024 * 1024)
+
     def __init__(self, title, link, description, pubDate=None, source=None):
-        super().__init__(title, link, description)
+        self.title = title
+        self.link = link
+        self.description = description
         self.pubDate = pubDate
         self.__source = source
+        self.__key = None
+
+    @classmethod
+    def fromItem(cls, item):
+        return cls(item.title, item.link, item.description, item.pubDate, item.source)
 
     def __get_pub_Date(self):
         if self.pubDate:
-            return (
-                "\n        <pubDate>"
-                + formatdate(time.mktime(self.pubDate.timetuple()))
-                + "</pubDate>"
-            )
+            return "\n        <pubDate>" + format_rfc822(self.pubDate) + "</pubDate>"
         else:
             return ""
 
@@ -100,7 +166,39 @@ class AtomItem(AtomBaseItem):
     #    else:
     #        return u""
 
+    def key(self):
+        """Hash of all fields that are rendered."""
+        if self.__key is None:
+            fields = (
+                self.title,
+                self.link,
+                self.description,
+                self.pubDate.isoformat() if self.pubDate else "",
+            )
+            self.__key = sha256("\0".join(fields).encode("utf-8")).digest()
+
+        return self.__key
+
+    def getInfo(self):
+        return INFO_TEMPLATE % (
+            escape(self.title),
+            escape(self.link),
+            escape(self.description),
+        )
+
     def getItem(self):
+        cache = AtomItem.fragment_cache
+        if cache is None:
+            return self._render()
+
+        fragment = cache.get(self.key())
+        if fragment is None:
+            fragment = self._render()
+            cache.store(self.key(), fragment)
+
+        return fragment
+
+    def _render(self):
         return """
     <item>
 %s%s%s
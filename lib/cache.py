@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+from collections import OrderedDict
+from hashlib import sha256
+from os import makedirs, path, remove, replace
+import json
+import threading
+import time
+
+
+class ResponseCache:
+    """On-disk cache of downloaded pages together with their validators
+    (ETag / Last-Modified). If the cache grows above `max_size` bytes, the
+    least recently used pages are removed."""
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory, max_size):
+        self._directory = path.expanduser(directory)
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        makedirs(self._directory, exist_ok=True)
+
+        # template: {'key': {'url': …, 'etag': …, 'last-modified': …, 'size': …}}
+        # ordered from least to most recently used
+        self._index = OrderedDict()
+        try:
+            with open(path.join(self._directory, self.INDEX_FILE)) as f:
+                self._index.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+        self._size = sum(entry["size"] for entry in self._index.values())
+
+    def _key(self, url):
+        return sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return path.join(self._directory, key)
+
+    def validators(self, url):
+        """Returns the request headers to revalidate the cached page."""
+        with self._lock:
+            entry = self._index.get(self._key(url))
+
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last-modified"]:
+                headers["If-Modified-Since"] = entry["last-modified"]
+        return headers
+
+    def get(self, url):
+        key = self._key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            # f.e. removed by hand, the validators must not be sent anymore
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry:
+                    self._size -= entry["size"]
+            return None
+
+    def store(self, url, body, etag, last_modified):
+        if not (etag or last_modified) or len(body) > self._max_size:
+            return
+
+        key = self._key(url)
+        with self._lock:
+            with open(self._body_path(key), "wb") as f:
+                f.write(body)
+
+            old_entry = self._index.pop(key, None)
+            if old_entry:
+                self._size -= old_entry["size"]
+
+            self._index[key] = {
+                "url": url,
+                "etag": etag,
+                "last-modified": last_modified,
+                "size": len(body),
+            }
+            self._size += len(body)
+
+            if self._size <= self._max_size:
+                return
+
+            removed = []
+            while self._size > self._max_size:
+                old_key, old_entry = self._index.popitem(last=False)
+                self._size -= old_entry["size"]
+                removed.append(old_key)
+
+            # the index on disk must not refer to removed pages
+            self._write_index()
+            for old_key in removed:
+                try:
+                    remove(self._body_path(old_key))
+                except OSError:
+                    pass
+
+    def _write_index(self):
+        index_path = path.join(self._directory, self.INDEX_FILE)
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(self._index, f)
+        replace(index_path + ".tmp", index_path)
+
+    def save(self):
+        with self._lock:
+            self._write_index()
+
+
+class DescriptionCache:
+    """Persistent store of feed entry descriptions, keyed by the entry link.
+    Entries older than `ttl` seconds are dropped. If the stored descriptions
+    exceed `max_size` bytes, the least recently used ones are removed."""
+
+    def __init__(self, file_path, ttl, max_size):
+        self._file_path = path.expanduser(file_path)
+        self._ttl = ttl
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        # template: {'link': {'description': …, 'stored': timestamp}}
+        # ordered from least to most recently used
+        self._entries = OrderedDict()
+        try:
+            with open(self._file_path) as f:
+                self._entries.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+        self._size = sum(len(e["description"]) for e in self._entries.values())
+
+    def get(self, link, now=None):
+        now = time.time() if now is None else now
+
+        with self._lock:
+            entry = self._entries.get(link)
+            if entry is None:
+                return None
+
+            if now - entry["stored"] > self._ttl:
+                self._remove(link)
+                return None
+
+            self._entries.move_to_end(link)
+            return entry["description"]
+
+    def store(self, link, description, now=None):
+        if not description or len(description) > self._max_size:
+            return
+
+        with self._lock:
+            if link in self._entries:
+                self._remove(link)
+
+            self._entries[link] = {
+                "description": description,
+                "stored": time.time() if now is None else now,
+            }
+            self._size += len(description)
+
+            while self._size > self._max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, link):
+        self._size -= len(self._entries.pop(link)["description"])
+
+    def save(self):
+        dir_path = path.dirname(self._file_path)
+        if dir_path:
+            makedirs(dir_path, exist_ok=True)
+
+        with self._lock:
+            with open(self._file_path + ".tmp", "w") as f:
+                json.dump(self._entries, f)
+            replace(self._file_path + ".tmp", self._file_path)
+
+
+class FragmentCache:
+    """In-memory cache of rendered feed fragments, keyed by a hash of the
+    fields they were rendered from. If the fragments exceed `max_size`
+    characters, the least recently used ones are removed."""
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        # ordered from least to most recently used
+        self._fragments = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def get(self, key):
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+            return fragment
+
+    def store(self, key, fragment):
+        if len(fragment) > self._max_size:
+            return
+
+        with self._lock:
+            if key in self._fragments:
+                self._size -= len(self._fragments.pop(key))
+
+            self._fragments[key] = fragment
+            self._size += len(fragment)
+
+            while self._size > self._max_size:
+                _, removed = self._fragments.popitem(last=False)
+                self._size -= len(removed)
+
+
+class SeenIds:
+    """Persistent record of the ids (f.e. of videos) already seen per key
+    (f.e. a channel). At most `max_per_key` ids are kept per key, the most
+    recently added ones."""
+
+    def __init__(self, file_path, max_per_key=1000):
+        self._file_path = path.expanduser(file_path)
+        self._max_per_key = max_per_key
+        self._lock = threading.Lock()
+
+        # template: {'key': ['id', …]}, oldest first
+        self._ids = {}
+        try:
+            with open(self._file_path) as f:
+                self._ids.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def count_seen(self, key, ids):
+        """Returns how many of `ids` were seen before."""
+        with self._lock:
+            seen = set(self._ids.get(key, ()))
+            return sum(1 for i in ids if i in seen)
+
+    def add(self, key, ids):
+        with self._lock:
+            known = dict.fromkeys(self._ids.get(key, ()))
+            for i in reversed(ids):
+                known.pop(i, None)
+                known[i] = None
+            self._ids[key] = list(known)[-self._max_per_key :]
+
+    def save(self):
+        dir_path = path.dirname(self._file_path)
+        if dir_path:
+            makedirs(dir_path, exist_ok=True)
+
+        with self._lock:
+            with open(self._file_path + ".tmp", "w") as f:
+                json.dump(self._ids, f)
+            replace(self._file_path + ".tmp", self._file_path)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import random
+import time
+
+from .metrics import RunMetrics
+from .Parser2Feed import FEED_MODES, ParserRunner
+
+
+class Daemon:
+    """Keeps running and parses every config section after its own
+    interval (option `interval` in minutes, default taken from GENERAL).
+    Failing sections are retried with exponential backoff. Only feeds that
+    contain a section which was parsed successfully are written again.
+    With a `publisher` (FeedPublisher), feeds are published in memory
+    instead of written."""
+
+    def __init__(self, config, modes, publisher=None):
+        self._config = config
+        self._modes = modes
+        self._publisher = publisher
+
+        # the metrics of sections that are not due in a tick are kept, so
+        # that every section is reported in every written report
+        self._metrics = RunMetrics()
+        self._runner = ParserRunner(self._config, self._metrics)
+
+        self._parsers = {}  # last successful parser per section
+        self._failures = {}  # template: {'Section': consecutive failures}
+        self._next_run = {section: 0 for section in self._sections()}
+
+    def _sections(self):
+        return [i for i in self._config if i != "GENERAL"]
+
+    def _general_option(self, key, default):
+        return float(self._config["GENERAL"].get(key, default))
+
+    def _interval(self, section):
+        """Seconds until `section` is parsed again, including jitter and
+        backoff."""
+        interval = 60 * float(
+            self._config[section].get(
+                "interval", self._config["GENERAL"].get("interval", 60)
+            )
+        )
+
+        failures = self._failures.get(section, 0)
+        if failures:
+            max_backoff = 60 * self._general_option("max-backoff", 1440)
+            interval = min(interval * 2**failures, max(interval, max_backoff))
+
+        jitter = self._general_option("interval-jitter", 0.1)
+        return interval * (1 + random.uniform(-jitter, jitter))
+
+    def tick(self, now=None):
+        """Parses all due sections and writes the affected feeds. Returns the
+        point in time when the next section is due."""
+        now = time.time() if now is None else now
+
+        due = [s for s in self._sections() if self._next_run[s] <= now]
+        if due:
+            metrics = self._metrics
+            metrics.start_run()
+            parsers, failed = self._runner.run(due)
+
+            changed = set()
+            for section in due:
+                if section in failed:
+                    self._failures[section] = self._failures.get(section, 0) + 1
+                    # keep the entries of the last successful run
+                    if section not in self._parsers and section in parsers:
+                        self._parsers[section] = parsers[section]
+                        changed.add(section)
+                else:
+                    self._failures.pop(section, None)
+                    self._parsers[section] = parsers[section]
+                    changed.add(section)
+
+                self._next_run[section] = now + self._interval(section)
+
+            if changed:
+                # keep the config order of the sections
+                ordered = {
+                    s: self._parsers[s] for s in self._sections() if s in self._parsers
+                }
+                for mode in self._modes:
+                    FEED_MODES[mode](
+                        self._config, ordered, changed, metrics, self._publisher
+                    )
+
+            metrics_location = self._config["GENERAL"].get("metrics-location")
+            if metrics_location:
+                metrics.write(metrics_location)
+
+        return min(self._next_run.values(), default=now + 60)
+
+    def close(self):
+        self._runner.close()
+
+    def run(self):
+        try:
+            while True:
+                next_run = self.tick()
+                time.sleep(max(1, next_run - time.time()))
+        finally:
+            self.close()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import re
+
+# f.e. '2024/03/01  12:00:00+0000' (soundcloud)
+SLASHED_RE = re.compile(
+    r"(\d{4})/(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{2}):(\d{2})"
+    r"\s*(?:(Z)|([+-])(\d{2}):?(\d{2}))?$"
+)
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MONTHS = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+
+def to_utc(date):
+    """Returns `date` as aware datetime in UTC. Naive datetimes are taken
+    as local time."""
+    if date.tzinfo is timezone.utc:
+        return date
+    return date.astimezone(timezone.utc)
+
+
+def now():
+    return datetime.now(timezone.utc)
+
+
+def parse_date(text, date_format=None):
+    """Parses the dates of the supported sites into aware UTC datetimes:
+    ISO 8601 (f.e. '2022-10-20T18:00:00Z' or '2024-03-01T06:00:00+01:00')
+    and '2024/03/01 12:00:00+0000'. Other formats need `date_format`
+    (strptime). Raises ValueError for unknown formats."""
+    text = text.strip()
+
+    if date_format:
+        return to_utc(datetime.strptime(text, date_format))
+
+    try:
+        return to_utc(datetime.fromisoformat(text))
+    except ValueError:
+        pass
+
+    # fromisoformat of Python < 3.11 knows neither 'Z' nor all ISO formats
+    if text.endswith("Z"):
+        try:
+            return to_utc(datetime.fromisoformat(text[:-1] + "+00:00"))
+        except ValueError:
+            pass
+
+    match = SLASHED_RE.match(text)
+    if not match:
+        raise ValueError("unknown date format: %r" % text)
+
+    year, month, day, hour, minute, second, _, sign, tz_hours, tz_minutes = (
+        match.groups()
+    )
+    tz = timezone.utc
+    if sign:
+        offset = timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+        tz = timezone(-offset if sign == "-" else offset)
+
+    return to_utc(
+        datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second), 0, tz
+        )
+    )
+
+
+@lru_cache(maxsize=4096)
+def _format_utc(date):
+    return "%s, %02d %s %04d %02d:%02d:%02d +0000" % (
+        WEEKDAYS[date.weekday()],
+        date.day,
+        MONTHS[date.month - 1],
+        date.year,
+        date.hour,
+        date.minute,
+        date.second,
+    )
+
+
+def format_rfc822(date):
+    """Formats `date` for RSS (RFC 822 with four-digit year) in UTC, f.e.
+    'Fri, 09 Nov 2001 01:08:47 +0000'. Naive datetimes are taken as local
+    time."""
+    return _format_utc(to_utc(date))
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+from email.utils import formatdate
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+import gzip
+import threading
+
+
+class PublishedFeed:
+    """A rendered feed as served: the UTF-8 body, its gzip version and
+    the validators of this render."""
+
+    __slots__ = ("body", "gzip_body", "etag", "last_modified", "content_hash")
+
+    def __init__(self, body, content_hash, now=None):
+        self.body = body
+        # compressed once per render, not per request
+        self.gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+        self.etag = '"%s"' % sha256(body).hexdigest()
+        self.last_modified = formatdate(now, usegmt=True)
+        self.content_hash = content_hash
+
+    def gzip_etag(self):
+        """The compressed body is another representation and needs its own
+        strong ETag."""
+        return self.etag[:-1] + '-gzip"'
+
+
+class FeedPublisher:
+    """Keeps the latest render of every feed in memory, keyed by the feed
+    file name (f.e. "feed.xml")."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._feeds = {}  # template: {'feed.xml': PublishedFeed}
+
+    def content_hash(self, name):
+        """AtomFeed.contentHash of the published feed `name` or None."""
+        with self._lock:
+            published = self._feeds.get(name)
+        return published.content_hash if published else None
+
+    def publish(self, name, feed, content_hash=None):
+        """Renders the AtomFeed `feed` and replaces the published one."""
+        if content_hash is None:
+            content_hash = feed.contentHash()
+        published = PublishedFeed(feed.getFeed().encode("utf-8"), content_hash)
+
+        with self._lock:
+            self._feeds[name] = published
+
+    def get(self, name):
+        with self._lock:
+            return self._feeds.get(name)
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """Serves the feeds of `server.publisher` under /<name>. Conditional GETs
+    with a matching If-None-Match are answered with 304."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        name = unquote(urlsplit(self.path).path).lstrip("/")
+        published = self.server.publisher.get(name) if name else None
+        if published is None:
+            self.send_error(404)
+            return
+
+        gzipped = self._accepts_gzip()
+        if gzipped:
+            body, etag = published.gzip_body, published.gzip_etag()
+        else:
+            body, etag = published.body, published.etag
+
+        if self._etag_matches(etag):
+            self.send_response(304)
+            self._send_validators(published, etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self._send_validators(published, etag)
+        self.end_headers()
+
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_validators(self, published, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", published.last_modified)
+        self.send_header("Vary", "Accept-Encoding")
+
+    def _accepts_gzip(self):
+        for coding in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = coding.partition(";")
+            if name.strip().lower() in ("gzip", "*"):
+                quality = params.strip().replace(" ", "")
+                return quality not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+        return False
+
+    def _etag_matches(self, etag):
+        if_none_match = self.headers.get("If-None-Match")
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+
+        # weak comparison, see RFC 9110, 13.1.2
+        tags = (tag.strip() for tag in if_none_match.split(","))
+        return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+    def log_message(self, *args):
+        pass
+
+
+class FeedServer(ThreadingHTTPServer):
+    """HTTP server for the feeds of a FeedPublisher, see serve_in_background."""
+
+    daemon_threads = True
+
+    def __init__(self, publisher, host="127.0.0.1", port=8080):
+        super().__init__((host, port), FeedRequestHandler)
+        self.publisher = publisher
+
+    def serve_in_background(self):
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import threading
+
+
+class Flight:
+    """A download of a single URL that other parsers can wait for."""
+
+    __slots__ = ("_event", "body", "error", "waiters")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.body = None
+        self.error = None
+        self.waiters = 0  # parsers that joined while it was downloaded
+
+    def wait(self):
+        """Returns the body, the error or (both None) if the download was
+        given up and has to be repeated."""
+        self._event.wait()
+        return self.body, self.error
+
+    def finish(self, body=None, error=None):
+        self.body = body
+        self.error = error
+        self._event.set()
+
+
+class FetchRegistry:
+    """Downloads of a single run, so that every URL is requested only once
+    (single-flight): the first parser that asks for a URL downloads it, all
+    others wait for it and share the body or the error."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}  # template: {'url': Flight}
+
+    def join(self, url):
+        """Returns the Flight of `url` and whether the caller has to download
+        it (then it must call Flight.finish or abandon)."""
+        with self._lock:
+            flight = self._flights.get(url)
+            if flight is not None:
+                if not flight._event.is_set():
+                    flight.waiters += 1
+                return flight, False
+
+            flight = self._flights[url] = Flight()
+            return flight, True
+
+    def abandon(self, url, flight):
+        """The download stopped before the end of the page, f.e. because
+        the parser had enough and nobody waited for the page. The next
+        parser downloads the page again."""
+        with self._lock:
+            if self._flights.get(url) is flight:
+                del self._flights[url]
+        flight.finish()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+
+
+class Item:
+    """Information about a single feed entry. Fields can be accessed as
+    attributes or like a dict (item["title"]), as with the dicts used
+    before."""
+
+    __slots__ = ("title", "link", "description", "pubDate", "source")
+
+    def __init__(self, title="", link=None, description="", pubDate=None, source=None):
+        self.title = title
+        self.link = link
+        self.description = description
+        self.source = source
+        self.pubDate = pubDate
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, Item):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join("%s=%r" % (k, getattr(self, k)) for k in self.__slots__)
+        return "Item(%s)" % fields
+
+    def keys(self):
+        return self.__slots__
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def as_dict(self):
+        """JSON serializable dict, see from_dict"""
+        data = {key: getattr(self, key) for key in self.__slots__}
+        if self.pubDate is not None:
+            data["pubDate"] = self.pubDate.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        item = cls(**data)
+        if item.pubDate is not None:
+            item.pubDate = datetime.fromisoformat(item.pubDate)
+        return item
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+from datetime import datetime
+from os import makedirs, path
+import sqlite3
+import threading
+import time
+
+from .item import Item
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    section TEXT NOT NULL,
+    link TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    source TEXT,
+    pubdate TEXT,
+    pubdate_ts REAL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (section, link)
+);
+CREATE INDEX IF NOT EXISTS items_by_section_date
+    ON items (section, pubdate_ts DESC, first_seen DESC);
+CREATE INDEX IF NOT EXISTS items_by_link ON items (link);
+"""
+
+# newest first; SQLite sorts NULL before all values, so entries without
+# pubDate come after all others and the order matches items_by_section_date
+ORDER_BY = "pubdate_ts DESC, first_seen DESC"
+
+
+class ItemStore:
+    """SQLite history of the entries of all sections. Entries that vanished
+    from their page are kept until they are older than `max_age` seconds or
+    their section has more than `max_items` entries. Both limits are
+    disabled with None."""
+
+    def __init__(self, file_path, max_age=None, max_items=None):
+        file_path = path.expanduser(file_path)
+        dir_path = path.dirname(file_path)
+        if dir_path:
+            makedirs(dir_path, exist_ok=True)
+
+        self._max_age = max_age
+        self._max_items = max_items
+        self._lock = threading.Lock()
+
+        self._db = sqlite3.connect(file_path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def merge(self, section, items, now=None):
+        """Inserts new entries of `section`, updates known ones and applies
+        the retention limits."""
+        now = time.time() if now is None else now
+
+        rows = [
+            (
+                section,
+                item.link or item.title,
+                item.title,
+                item.description,
+                item.source,
+                item.pubDate.isoformat() if item.pubDate else None,
+                item.pubDate.timestamp() if item.pubDate else None,
+                now,
+                now,
+            )
+            for item in items
+        ]
+
+        with self._lock, self._db:
+            self._db.executemany(
+                """INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (section, link) DO UPDATE SET
+                    title = excluded.title,
+                    description = excluded.description,
+                    source = excluded.source,
+                    pubdate = excluded.pubdate,
+                    pubdate_ts = excluded.pubdate_ts,
+                    last_seen = excluded.last_seen""",
+                rows,
+            )
+            self._prune(section, now)
+
+    def _prune(self, section, now):
+        # entries that are still on the page (last_seen == now) are kept
+        if self._max_age:
+            self._db.execute(
+                """DELETE FROM items WHERE section = ? AND last_seen < ?
+                AND COALESCE(pubdate_ts, first_seen) < ?""",
+                (section, now, now - self._max_age),
+            )
+
+        if self._max_items:
+            self._db.execute(
+                """DELETE FROM items WHERE section = ? AND last_seen < ?
+                AND rowid NOT IN (
+                    SELECT rowid FROM items WHERE section = ?
+                    ORDER BY %s LIMIT ?
+                )"""
+                % ORDER_BY,
+                (section, now, section, self._max_items),
+            )
+
+    def items(self, sections, max_items=None):
+        """Entries of `sections`, newest first."""
+        if not sections:
+            return []
+
+        query = """SELECT title, link, description, pubdate, source FROM items
+            WHERE section IN (%s) ORDER BY %s""" % (
+            ", ".join("?" * len(sections)),
+            ORDER_BY,
+        )
+        params = list(sections)
+        if max_items:
+            query += " LIMIT ?"
+            params.append(max_items)
+
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+
+        return [
+            Item(
+                title,
+                link,
+                description,
+                datetime.fromisoformat(pubdate) if pubdate else None,
+                source,
+            )
+            for title, link, description, pubdate, source in rows
+        ]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+from os import makedirs, path, replace
+import json
+import threading
+import time
+
+# name, help text, key in the section report
+SECTION_METRICS = (
+    ("section_duration_seconds", "Wall time to download and parse", "time"),
+    ("section_fetch_seconds", "Time spent waiting for the network", "fetch_time"),
+    ("section_downloaded_bytes", "Downloaded bytes", "bytes"),
+    ("section_requests", "Number of HTTP requests", "requests"),
+    ("section_http_status", "HTTP status of the source page", "status"),
+    ("section_cache_hits", "Pages taken from the response cache", "cache_hits"),
+    (
+        "section_shared_fetches",
+        "Pages downloaded by another section of the run",
+        "shared_fetches",
+    ),
+    (
+        "section_description_cache_hits",
+        "Descriptions taken from the description cache",
+        "description_cache_hits",
+    ),
+    ("section_items", "Number of parsed entries", "items"),
+    ("section_errors", "Number of errors", "errors"),
+    ("section_failed", "1 if the section failed", "failed"),
+)
+
+FEED_METRICS = (
+    ("feed_render_seconds", "Time to render the feed", "render_time"),
+    ("feed_write_seconds", "Time to write the feed", "write_time"),
+    ("feed_items", "Number of entries in the feed", "items"),
+    ("feed_written", "1 if the feed changed and was written", "written"),
+)
+
+
+class RunMetrics:
+    """Collects timings, downloaded bytes, item counts, etc. of all sections
+    and feeds of a single run or, with start_run, of the latest run of
+    every section and feed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.time()
+
+        self.sections = {}  # template: {'Section': {'time': …, 'items': …}}
+        self.feeds = {}  # template: {'Filename': {'render_time': …}}
+
+    def start_run(self):
+        """Starts the next run. Sections and feeds of earlier runs are kept
+        until they are recorded again (see Daemon)."""
+        with self._lock:
+            self._start = time.time()
+
+    def record_section(self, section, parser, wall_time, error=None):
+        stats = dict(parser.getStats()) if parser else {}
+        errors = [str(e) for e in parser.getErrors()] if parser else []
+        if error:
+            errors.append(str(error))
+
+        report = {
+            "parser": str(parser) if parser else None,
+            "time": wall_time,
+            "fetch_time": stats.get("fetch_time", 0.0),
+            "bytes": stats.get("bytes", 0),
+            "requests": stats.get("requests", 0),
+            "status": stats.get("status"),
+            "cache_hits": stats.get("cache_hits", 0),
+            "shared_fetches": stats.get("shared_fetches", 0),
+            "description_cache_hits": stats.get("description_cache_hits", 0),
+            "items": len(parser.getData()) if parser else 0,
+            "errors": len(errors) + stats.get("description_errors", 0),
+            "error_messages": errors,
+            "failed": int(bool(errors)),
+        }
+
+        with self._lock:
+            self.sections[section] = report
+
+    def record_feed(self, feed_path, render_time, write_time, items, written):
+        with self._lock:
+            self.feeds[feed_path] = {
+                "render_time": render_time,
+                "write_time": write_time,
+                "items": items,
+                "written": int(written),
+            }
+
+    def report(self):
+        with self._lock:
+            return {
+                "start": self._start,
+                "duration": time.time() - self._start,
+                "sections": dict(self.sections),
+                "feeds": dict(self.feeds),
+            }
+
+    def prometheus(self):
+        """Report in the Prometheus text format, f.e. for the textfile
+        collector of node_exporter."""
+        report = self.report()
+        lines = [
+            "# HELP html2rss_run_start_seconds Start of the last run",
+            "# TYPE html2rss_run_start_seconds gauge",
+            "html2rss_run_start_seconds %s" % report["start"],
+            "# HELP html2rss_run_duration_seconds Duration of the last run",
+            "# TYPE html2rss_run_duration_seconds gauge",
+            "html2rss_run_duration_seconds %s" % report["duration"],
+        ]
+
+        for metrics, label, values in (
+            (SECTION_METRICS, "section", report["sections"]),
+            (FEED_METRICS, "feed", report["feeds"]),
+        ):
+            for name, help_text, key in metrics:
+                lines.append("# HELP html2rss_%s %s" % (name, help_text))
+                lines.append("# TYPE html2rss_%s gauge" % name)
+                for label_value, entry in values.items():
+                    if entry[key] is None:
+                        continue
+                    lines.append(
+                        'html2rss_%s{%s="%s"} %s'
+                        % (name, label, _escape_label(label_value), entry[key])
+                    )
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory):
+        """Writes metrics.json and html2rss.prom to `directory`."""
+        directory = path.expanduser(directory)
+        makedirs(directory, exist_ok=True)
+
+        for filename, content in (
+            ("metrics.json", json.dumps(self.report(), indent=2)),
+            ("html2rss.prom", self.prometheus()),
+        ):
+            file_path = path.join(directory, filename)
+            with open(file_path + ".tmp", "w") as f:
+                f.write(content)
+            replace(file_path + ".tmp", file_path)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+from importlib import import_module
+import threading
+
+# entry point group of parsers shipped in other packages, f.e.
+# [project.entry-points."html2rss.parsers"]
+# mysite = "mypackage.parser:MySiteParser"
+ENTRY_POINT_GROUP = "html2rss.parsers"
+
+# template: {"name used in the config": "module:class"}, relative modules
+# are imported from this package
+BUILTIN_PARSERS = {
+    "funk": ".site_parsers:FunkParser",
+    "idparser": ".site_parsers:IdParser",
+    "soundcloud": ".site_parsers:SoundcloudParser",
+    "szparser": ".site_parsers:SzParser",
+    "selector": ".selector_parser:SelectorParser",
+}
+
+
+class ParserRegistry:
+    """Maps the parser names of the config to parser classes. Classes are
+    registered by their import path and the module is only imported when a
+    config section uses the parser. Besides the built-in parsers, every
+    entry point of the group ENTRY_POINT_GROUP is registered.
+
+    A parser class needs a `from_config(options, max_items)` classmethod
+    (see GenericParser.from_config)."""
+
+    def __init__(self, parsers=BUILTIN_PARSERS, entry_points=True):
+        self._paths = dict(parsers)
+        self._classes = {}
+        self._entry_points = {}
+        self._entry_points_loaded = not entry_points
+        self._lock = threading.Lock()
+
+    def register(self, name, parser):
+        """`parser` is a class or its import path as "module:class"."""
+        if isinstance(parser, str):
+            self._paths[name] = parser
+            self._classes.pop(name, None)
+        else:
+            self._classes[name] = parser
+
+    def get(self, name):
+        """Returns the parser class, KeyError for unknown names."""
+        if name in self._classes:
+            return self._classes[name]
+
+        if name in self._paths:
+            module_name, _, class_name = self._paths[name].partition(":")
+            parser = getattr(import_module(module_name, __package__), class_name)
+        else:
+            self._load_entry_points()
+            parser = self._entry_points[name].load()
+
+        self._classes[name] = parser
+        return parser
+
+    def _load_entry_points(self):
+        """Looks up the entry points once, without importing them. Parsers
+        of several sections are chosen concurrently, the others wait until
+        all entry points are known."""
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+
+            # importlib.metadata alone takes longer to import than the registry
+            from importlib import metadata
+
+            for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+                # built-in and explicitly registered parsers take precedence
+                self._entry_points.setdefault(entry_point.name, entry_point)
+            self._entry_points_loaded = True
+
+
+registry = ParserRegistry()
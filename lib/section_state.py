@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+from os import makedirs, path, replace
+import json
+import threading
+import time
+
+from .item import Item
+
+
+class SectionState:
+    """State of every config section between runs: the entries of its last
+    successful run and its consecutive failures. A section that failed
+    `max_failures` times in a row is not downloaded again until `cooldown`
+    seconds after its last failure (circuit breaker). If `file_path` is
+    None, the state is not persisted.
+
+    Descriptions found in `description_cache` are not stored but read from
+    it again, other descriptions longer than `max_description_size` are
+    left out."""
+
+    max_description_size = 4 * 1024
+
+    def __init__(self, file_path, max_failures, cooldown, description_cache=None):
+        self._file_path = path.expanduser(file_path) if file_path else None
+        self._max_failures = max_failures
+        self._cooldown = cooldown
+        self._description_cache = description_cache
+        self._lock = threading.Lock()
+
+        # template: {'Section': {'parser': …, 'items': [{…}], 'failures': …,
+        #            'last-failure': timestamp}}
+        self._sections = {}
+        if self._file_path:
+            try:
+                with open(self._file_path) as f:
+                    self._sections = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def is_open(self, section, now=None):
+        """True, if `section` should not be downloaded right now."""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            state = self._sections.get(section, {})
+            return (
+                self._max_failures > 0
+                and state.get("failures", 0) >= self._max_failures
+                and now < state.get("last-failure", 0) + self._cooldown
+            )
+
+    def record_success(self, section, parser):
+        items = [self._stored_item(item) for item in parser.getData()]
+
+        with self._lock:
+            self._sections[section] = {
+                "parser": str(parser),
+                "items": items,
+                "failures": 0,
+            }
+
+    def _stored_item(self, item):
+        data = item.as_dict()
+        description = data["description"]
+        if len(description) > self.max_description_size or (
+            self._description_cache
+            and self._description_cache.get(item.link) == description
+        ):
+            del data["description"]
+        return data
+
+    def record_failure(self, section, now=None):
+        with self._lock:
+            state = self._sections.setdefault(section, {})
+            state["failures"] = state.get("failures", 0) + 1
+            state["last-failure"] = time.time() if now is None else now
+
+    def last_parser(self, section):
+        """Stand-in parser with the entries of the last successful run or
+        None, if there was none."""
+        with self._lock:
+            state = self._sections.get(section)
+            if not state or "items" not in state:
+                return None
+
+            items = [Item.from_dict(item) for item in state["items"]]
+            name = state["parser"]
+
+        for item, data in zip(items, state["items"]):
+            if "description" not in data and self._description_cache:
+                item.description = self._description_cache.get(item.link) or ""
+        return StoredParser(name, items)
+
+    def save(self):
+        if not self._file_path:
+            return
+
+        dir_path = path.dirname(self._file_path)
+        if dir_path:
+            makedirs(dir_path, exist_ok=True)
+
+        with self._lock:
+            with open(self._file_path + ".tmp", "w") as f:
+                json.dump(self._sections, f)
+            replace(self._file_path + ".tmp", self._file_path)
+
+
+class StoredParser:
+    """Provides stored entries with the interface of a parser."""
+
+    def __init__(self, name, items):
+        self._name = name
+        self._items = items
+
+    def __str__(self):
+        return self._name
+
+    def getData(self):
+        return self._items
+
+    def getErrors(self):
+        return []
+
+    def getStats(self):
+        return {}
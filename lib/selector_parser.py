@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+
+from functools import lru_cache
+from urllib.parse import urljoin
+import re
+
+from . import dates
+from .item import Item
+from .Parser import DescriptionParser, GenericParser, MissingOptionError
+
+SELECTOR_RE = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?"
+    r"(?P<conditions>(?:[.#][\w-]+|\[[^\]]+\])*)"
+    r"(?:@(?P<attribute>[\w-]+))?$"
+)
+CONDITION_RE = re.compile(
+    r"\.(?P<cls>[\w-]+)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w-]+)\s*(?:=\s*[\"']?(?P<value>[^\"'\]]*)[\"']?\s*)?\]"
+)
+
+# template: ((field of Item, config option),)
+FIELD_OPTIONS = (
+    ("title", "title-selector"),
+    ("link", "link-selector"),
+    ("pubDate", "date-selector"),
+    ("description", "description-selector"),
+)
+
+REQUIRED_OPTIONS = ("item-selector", "link-selector")
+
+# elements without end tag
+VOID_TAGS = DescriptionParser.VOID_TAGS
+
+
+class SelectorError(ValueError):
+    def __init__(self, selector):
+        self.selector = selector
+
+    def __str__(self):
+        return repr('"%s" is not a valid selector.' % self.selector)
+
+
+class Rule:
+    """Compiled simple selector like `tag.class#id[attr=value]@attribute`.
+    With `@attribute` the value of the attribute is taken instead of the
+    text of the element."""
+
+    __slots__ = ("field", "tag", "classes", "id", "attrs", "attribute")
+
+    def __init__(self, field, selector):
+        match = SELECTOR_RE.match(selector.strip())
+        if not match or not selector.strip():
+            raise SelectorError(selector)
+
+        self.field = field
+        self.tag = match["tag"] if match["tag"] != "*" else None
+        self.attribute = match["attribute"]
+        self.classes = set()
+        self.id = None
+        self.attrs = []  # template: [(name, value or None)]
+
+        conditions = match["conditions"]
+        for condition in CONDITION_RE.finditer(conditions):
+            if condition["cls"]:
+                self.classes.add(condition["cls"])
+            elif condition["id"]:
+                self.id = condition["id"]
+            else:
+                self.attrs.append((condition["attr"], condition["value"]))
+
+        parsed = "".join(c.group(0) for c in CONDITION_RE.finditer(conditions))
+        if parsed != conditions:
+            raise SelectorError(selector)
+        if self.tag:
+            self.tag = self.tag.lower()
+
+    def matches(self, attrs):
+        """`attrs` as dict; the tag was already checked by the dispatch
+        table."""
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes and not self.classes.issubset(
+            (attrs.get("class") or "").split()
+        ):
+            return False
+        for name, value in self.attrs:
+            if name not in attrs or (value is not None and attrs[name] != value):
+                return False
+        return True
+
+
+def _dispatch_table(rules):
+    """Returns {'tag': [rules]} and the rules for all other tags. Rules
+    without tag are added to every list, so a start tag needs only a single
+    lookup."""
+    wildcard = [rule for rule in rules if rule.tag is None]
+
+    table = {}
+    for rule in rules:
+        if rule.tag is not None:
+            table.setdefault(rule.tag, []).append(rule)
+    for tag in table:
+        table[tag].extend(wildcard)
+
+    return table, wildcard
+
+
+@lru_cache(maxsize=None)
+def compile_rules(item_selector, field_selectors):
+    """Returns the dispatch tables (see _dispatch_table) for the item
+    container and the fields. `field_selectors` is a tuple of (field,
+    selector)."""
+    item_rules = [Rule(None, s) for s in item_selector.split(",")]
+    field_rules = [
+        Rule(field, s)
+        for field, selector in field_selectors
+        for s in selector.split(",")
+    ]
+    return _dispatch_table(item_rules), _dispatch_table(field_rules)
+
+
+class SelectorParser(GenericParser):
+    """Parser configured by CSS-like selectors in its config section:
+    `item-selector` for the element of an entry and `title-selector`,
+    `link-selector`, `date-selector`, `description-selector` for elements
+    inside of it. Dates are parsed with `date-format` (strptime) or as ISO
+    format. `item-selector` and `link-selector` are required, entries
+    without link are left out."""
+
+    def __init__(self, url, options, max_items=None):
+        for option in REQUIRED_OPTIONS:
+            if not options.get(option):
+                raise MissingOptionError(option)
+
+        super().__init__(url, max_items)
+
+        field_selectors = tuple(
+            (field, options[option])
+            for field, option in FIELD_OPTIONS
+            if options.get(option)
+        )
+        item_tables, field_tables = compile_rules(
+            options["item-selector"], field_selectors
+        )
+        self._item_table, self._item_default = item_tables
+        self._field_table, self._field_default = field_tables
+        self._date_format = options.get("date-format")
+        self._name = options.get("parser-name", "Selector")
+
+        self._open_tags = []  # open elements of the current entry
+        self._captures = []  # template: [(field, depth, [text])]
+        self._found = set()  # fields of the current entry that are set
+
+        self._parse_URLs()
+
+    @classmethod
+    def from_config(cls, options, max_items=None):
+        return cls(options["source-url"], options, max_items)
+
+    def __str__(self):
+        return self._name
+
+    def _set_field(self, field, value):
+        if field in self._found:
+            return
+        self._found.add(field)
+
+        if field == "title" or field == "description":
+            value = self.rm_whitespace(value)
+        elif field == "link":
+            value = urljoin(self._url, value.strip())
+        elif field == "pubDate":
+            value = self._parse_date(value.strip())
+
+        self._act_info[field] = value
+
+    def _parse_date(self, value):
+        try:
+            return dates.parse_date(value, self._date_format)
+        except ValueError:
+            return None
+
+    def handle_starttag(self, tag, attrs):
+        if not self._open_tags:
+            rules = self._item_table.get(tag, self._item_default)
+            if not rules:
+                return
+
+            attrs = self._attrs_to_dict(attrs)
+            for rule in rules:
+                if rule.matches(attrs):
+                    self._open_tags.append(tag)
+                    self._match_fields(tag, attrs)
+                    return
+            return
+
+        if tag not in VOID_TAGS:
+            self._open_tags.append(tag)
+
+        if tag in self._field_table or self._field_default:
+            self._match_fields(tag, self._attrs_to_dict(attrs))
+
+    def _match_fields(self, tag, attrs):
+        for rule in self._field_table.get(tag, self._field_default):
+            if rule.field in self._found or not rule.matches(attrs):
+                continue
+
+            if rule.attribute:
+                if attrs.get(rule.attribute) is not None:
+                    self._set_field(rule.field, attrs[rule.attribute])
+            elif tag not in VOID_TAGS:
+                self._captures.append((rule.field, len(self._open_tags), []))
+
+    def handle_data(self, data):
+        for _, _, text in self._captures:
+            text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag not in self._open_tags:
+            return
+
+        while self._open_tags:
+            if self._open_tags.pop() == tag:
+                break
+
+        depth = len(self._open_tags)
+        while self._captures and self._captures[-1][1] > depth:
+            field, _, text = self._captures.pop()
+            self._set_field(field, "".join(text))
+
+        if not self._open_tags:
+            self._captures = []
+            self._found = set()
+            if self._act_info.link:
+                self._next_url_info()
+            else:
+                self._act_info = Item(source=self._url)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+"""Parsers of single sites, registered in lib.registry."""
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import json
+
+from . import dates
+from .Parser import DescriptionFetcher, DescriptionParser, GenericParser
+
+
+class SoundcloudDescriptionParser(GenericParser):
+    def __init__(self, url):
+        super().__init__(url)
+
+        self._inside_article = False
+        self._description_text = ""
+
+        self._parse_URLs()
+
+    def getData(self):
+        return self._description_text
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "article":
+            self._inside_article = True
+            return
+
+        if tag == "meta" and self._inside_article:
+            attrs = self._attrs_to_dict(attrs)
+            if (
+                "itemprop" in attrs
+                and attrs["itemprop"] == "description"
+                and "content" in attrs
+            ):
+                self._description_text = attrs["content"]
+
+    def handle_endtag(self, tag):
+        if tag == "article" and self._inside_article:
+            self._inside_article = False
+
+
+class SoundcloudParser(GenericParser):
+    def __init__(self, url, max_items=None):
+        super().__init__(url, max_items)
+
+        self._found_track = False
+
+        self._collect_pubdate = False
+        self._pubdate_string = ""
+
+        self._collect_title = False
+        self._title_string = ""
+
+        self._parse_URLs()
+        self._fetch_descriptions(SoundcloudDescriptionParser)
+
+    def __str__(self):
+        return "Soundcloud"
+
+    def _next_url_info(self):
+        GenericParser._next_url_info(self)
+
+        self._pubdate_string = ""
+        self._title_string = ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = self._attrs_to_dict(attrs)
+
+        if tag == "article" and "class" in attrs and attrs["class"] == "audible":
+            self._found_track = True
+
+        if self._found_track:
+            if tag == "a" and "itemprop" in attrs and attrs["itemprop"] == "url":
+                self._act_info.link = urljoin(self._url, attrs["href"])
+                self._collect_title = True
+
+            if tag == "time" and "pubdate" in attrs:
+                self._collect_pubdate = True
+
+    def handle_data(self, data):
+        if self._collect_pubdate:
+            self._pubdate_string += data
+
+        if self._collect_title:
+            self._title_string += data
+
+    def handle_endtag(self, tag):
+        if tag == "article" and self._found_track:
+            self._found_track = False
+            self._next_url_info()
+
+        if tag == "a" and self._collect_title:
+            self._act_info.title = self.rm_whitespace(self._title_string)
+            self._collect_title = False
+
+        if tag == "time" and self._collect_pubdate:
+            self._collect_pubdate = False
+
+            # f.e. '2024-03-01T12:00:00Z' or '2024/03/01  12:00:00+0000'
+            self._act_info.pubDate = dates.parse_date(self._pubdate_string)
+
+
+class IdParser(GenericParser):
+    def __init__(self, url, max_items=None):
+        super().__init__(url, max_items)
+
+        self._id_found = False
+
+        self._tag = "a"
+        self._id = "link_archive"
+
+        self._parse_URLs()
+
+    def __str__(self):
+        return "ID"
+
+    def handle_starttag(self, tag, attrs):
+        if tag == self._tag:
+            attrs = self._attrs_to_dict(attrs)
+            if attrs.get("id") == self._id:
+                self._id_found = True
+
+                link = urljoin(self._url, attrs["href"])
+                self._act_info.link = link
+                self._act_info.pubDate = dates.now()
+        elif tag == "img" and self._id_found:
+            attrs = self._attrs_to_dict(attrs)
+            src = urljoin(self._url, attrs["src"])
+            self._act_info.description = f'<img src="{ src }" />'
+
+    def handle_endtag(self, tag):
+        if tag == self._tag and self._id_found:
+            self._id_found = False
+            self._next_url_info()
+            self._stop_parsing()
+
+
+class SzParser(GenericParser):
+    def __init__(self, url, max_items=None):
+        super().__init__(url, max_items)
+
+        self.__found_entry = False
+        self.__inside_style = False
+        self.__inside_heading = False
+
+        self._parse_URLs()
+        self._fetch_descriptions(DescriptionParser)
+
+    def __str__(self):
+        return "SZ"
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "article":
+            self.__found_entry = True
+ 
+        if self.__found_entry and tag == "a":
+            attrs = self._attrs_to_dict(attrs)
+            self._act_info.link = attrs["href"]
+
+        if self.__found_entry and tag == "time":
+            attrs = self._attrs_to_dict(attrs)
+            self._act_info.pubDate = dates.parse_date(attrs.get("datetime"))
+
+        if tag == "style":
+            self.__inside_style = True
+
+        if tag == "h3":
+            self.__inside_heading = True
+
+    def handle_data(self, data):
+        if self.__found_entry and self.__inside_heading and not self.__inside_style:
+            self._act_info.title += data
+
+    def handle_endtag(self, tag):
+        if tag == "article" and self.__found_entry:
+            self.__found_entry = False
+
+            self._act_info.title = self.rm_whitespace(self._act_info.title)
+
+            self._next_url_info()
+
+        if tag == "style":
+            self.__inside_style = False
+
+        if tag == "h3" and self.__inside_heading:
+            self.__inside_heading = False
+
+class FunkParser(GenericParser):
+    """Videos of a funk channel. Up to `max_pages` pages of `page_size`
+    videos are requested, several at once (see DescriptionFetcher's
+    max_per_host), or one at a time after a page of mostly known videos.
+    Paging stops at a page that contains only videos of earlier runs (see
+    GenericParser.seen_ids), that is not full or that failed."""
+
+    api_url = "https://www.funk.net/api/frontend/webapp/video-channels/{channel_id}/videos?page={page}&size={size}"
+
+    def __init__(self, channel_id, max_items=None, max_pages=1, page_size=10):
+        self.channel_id = channel_id
+        self.page_size = page_size
+        url = self._page_url(0)
+        super().__init__(url, max_items)
+
+        self._seen_key = "funk/%s" % channel_id
+        self._aliases = []  # of all downloaded videos
+        self._last_page = False
+        self._mostly_seen = False  # the last page
+
+        # the first page alone is enough for channels without new videos
+        self.handle_json(self._download_page())
+        page = 1
+        while page < max_pages and self._fetch_more():
+            # after a page of mostly known videos, the next one is probably
+            # the last one
+            burst = 1 if self._mostly_seen else DescriptionFetcher.max_per_host
+            pages = range(page, min(max_pages, page + burst))
+            with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+                fetchers = list(executor.map(self._download_other_page, pages))
+
+            for fetcher, _ in fetchers:
+                for key, value in fetcher.getStats().items():
+                    if key != "status":
+                        self._stats[key] += value
+
+            for fetcher, body in fetchers:
+                if not self._fetch_more():
+                    break
+                if fetcher.getErrors():
+                    # the videos of the pages before are kept
+                    self._errors.extend(fetcher.getErrors())
+                    break
+                self.handle_json(body)
+            page = pages.stop
+
+        if self.seen_ids is not None and not self._errors:
+            self.seen_ids.add(self._seen_key, self._aliases)
+
+    @classmethod
+    def from_config(cls, options, max_items=None):
+        return cls(
+            options["channel-id"],
+            max_items,
+            int(options.get("max-pages", 1)),
+            int(options.get("page-size", 10)),
+        )
+
+    def __str__(self):
+        return "Funk"
+
+    def _page_url(self, page):
+        return self.api_url.format(
+            channel_id=self.channel_id, page=page, size=self.page_size
+        )
+
+    def _download_other_page(self, page):
+        """Returns the GenericParser that downloaded `page` (for its stats
+        and errors) and the page."""
+        fetcher = GenericParser(self._page_url(page))
+        return fetcher, fetcher._download_page()
+
+    def _fetch_more(self):
+        return not self._done and not self._errors and not self._last_page
+
+    def handle_json(self, json_response):
+        self._last_page = True
+        try:
+            python_struct = json.loads(json_response)
+        except json.decoder.JSONDecodeError as error:
+            self._report_error(error)
+            return
+
+        aliases = [element["alias"] for element in python_struct["list"]]
+        self._aliases.extend(aliases)
+        seen = 0
+        if self.seen_ids is not None:
+            seen = self.seen_ids.count_seen(self._seen_key, aliases)
+        self._last_page = len(aliases) < self.page_size or seen == len(aliases)
+        self._mostly_seen = seen * 2 > len(aliases)
+
+        for element in python_struct["list"]:
+            if self._done:
+                break
+
+            self._act_info.title = element["title"]
+            self._act_info.description = element["shortDescription"]
+
+            video_alias = element["alias"]
+            channel_alias = element["channelAlias"]
+            link = f"https://www.funk.net/channel/{channel_alias}/{video_alias}"
+            self._act_info.link = link
+
+            # f.e. '2022-10-20T18:00:00Z'
+            self._act_info.pubDate = dates.parse_date(element["publicationDate"])
+
+            self._next_url_info()
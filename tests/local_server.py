@@ -0,0 +1,16 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+
+def start_server(test_case, handler_class):
+    """Serves `handler_class` on a free local port until `test_case` is
+    cleaned up. Returns the base URL without trailing slash."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    # connections closed early by the clients are expected
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_case.addCleanup(server.server_close)
+    test_case.addCleanup(server.shutdown)
+
+    return "http://127.0.0.1:%s" % server.server_port
@@ -1,8 +1,11 @@
+import io
 import unittest
 from unittest.mock import patch
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
-from lib.atom_generator import AtomFeed
+from lib.atom_generator import AtomFeed, AtomItem
+from lib.cache import FragmentCache
+from lib.item import Item
 
 
 class TestGenerators(unittest.TestCase):
@@ -94,7 +97,8 @@ class TestGenerators(unittest.TestCase):
                 title,
                 "http://example.org/article",
                 "Article description should normally be here!",
-                datetime.now(),
+                # items are formatted by lib.dates, not by formatdate
+                datetime(2001, 11, 9, 2, 8, 47, tzinfo=timezone(timedelta(hours=1))),
                 "http://example.org/list-articles",
             )
 
@@ -115,15 +119,101 @@ class TestGenerators(unittest.TestCase):
         <title>Testarticle with source and pubDate 0</title>
         <link>http://example.org/article</link>
         <description>Article description should normally be here!</description>
-        <pubDate>Fri, 09 Nov 2001 01:08:47 -0000</pubDate>
+        <pubDate>Fri, 09 Nov 2001 01:08:47 +0000</pubDate>
     </item>
     <item>
         <title>Testarticle with source and pubDate 1</title>
         <link>http://example.org/article</link>
         <description>Article description should normally be here!</description>
-        <pubDate>Fri, 09 Nov 2001 01:08:47 -0000</pubDate>
+        <pubDate>Fri, 09 Nov 2001 01:08:47 +0000</pubDate>
     </item>
 </channel>
 
 </rss>""",
         )
+
+    def test_feed_writing__equals_generation(self):
+        for i in range(0, 3):
+            self.feed.addItem(
+                "Testarticle %s" % i,
+                "http://example.org/article",
+                "Article <b>description</b> & more",
+                datetime.now(),
+            )
+
+        file = io.StringIO()
+        self.feed.writeFeed(file)
+
+        self.assertEqual(file.getvalue(), self.feed.getFeed())
+
+    def test_escaping(self):
+        self.feed.addItem("A <b>&</b> B", "http://example.org/?a=1&b=2", "1 > 0")
+
+        self.assertIn(
+            """        <title>A &#60;b&#62;&#38;&#60;/b&#62; B</title>
+        <link>http://example.org/?a=1&#38;b=2</link>
+        <description>1 &#62; 0</description>""",
+            self.feed.getFeed(),
+        )
+
+    def test_fragment_cache__renders_only_changed_items(self):
+        patcher = patch.object(AtomItem, "fragment_cache", FragmentCache(2**20))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def build_feed(*descriptions):
+            feed = AtomFeed("Test", "http://example.org", "Just for test purposes")
+            for i, description in enumerate(descriptions):
+                feed.addItem(
+                    "Testarticle %s" % i,
+                    "http://example.org/article/%s" % i,
+                    description,
+                    datetime(2020, 1, 1 + i),
+                )
+            return feed
+
+        first = build_feed("a", "b", "c")
+        first_feed = first.getFeed()
+
+        with patch.object(AtomItem, "_render", autospec=True) as render:
+            render.side_effect = lambda item: "<item/>"
+
+            unchanged = build_feed("a", "b", "c")
+            self.assertEqual(unchanged.getFeed(), first_feed)
+            self.assertEqual(unchanged.contentHash(), first.contentHash())
+            self.assertFalse(render.called)
+
+            changed = build_feed("a", "b", "c & d")
+            changed.getFeed()
+            self.assertEqual(render.call_count, 1)
+            self.assertNotEqual(changed.contentHash(), first.contentHash())
+
+    def test_sort__without_dates_and_mixed_timezones(self):
+        aware = datetime(2020, 1, 2, 12, tzinfo=timezone(timedelta(hours=2)))
+        naive = datetime(2020, 1, 3)
+        for title, pubDate in (("none", None), ("aware", aware), ("naive", naive)):
+            self.feed.addItem(Item(title, "http://example.org/" + title, "", pubDate))
+
+        self.feed.sort_items_after_date()
+
+        titles = [item.title for item in self.feed.itemlist]
+        self.assertEqual(titles, ["naive", "aware", "none"])
+
+    def test_add_runs__merges_top_n(self):
+        def run(name, *days):
+            return [
+                Item("%s %s" % (name, day), "", "", datetime(2020, 1, day))
+                for day in days
+            ]
+
+        feed = AtomFeed("Test", "http://example.org", "Test", max_items=4)
+        feed.addRuns(
+            [
+                run("a", 9, 5, 1),
+                run("b", 8, 7, 2),
+                run("c", 3, 10) + [Item("c none", "", "")],
+            ]
+        )
+
+        titles = [item.title for item in feed.itemlist]
+        self.assertEqual(titles, ["c 10", "a 9", "b 8", "b 7"])
@@ -0,0 +1,17 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.run import run
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_all_benchmarks_parse_their_fixtures(self):
+        with patch("builtins.print") as print_mock:
+            report = run([5], 1)
+
+        print_mock.assert_not_called()
+        self.assertGreater(len(report["results"]), 0)
+        for result in report["results"]:
+            with self.subTest(name=result["name"], items=result["expected_items"]):
+                self.assertEqual(result["items"], result["expected_items"])
+                self.assertGreater(result["peak_memory"], 0)
@@ -0,0 +1,220 @@
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+from os import path, remove
+
+from lib.cache import DescriptionCache, FragmentCache, ResponseCache
+from lib.Parser import DescriptionFetcher, GenericParser
+
+from .local_server import start_server
+
+
+class ConditionalHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = "<p>cached page</p>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+
+    def test_validators_and_persistence(self):
+        cache = ResponseCache(self.directory, 1024)
+        cache.store("http://example.org/", b"body", '"abc"', "Mon, 01 Jan 2024")
+        cache.save()
+
+        cache = ResponseCache(self.directory, 1024)
+        self.assertEqual(
+            cache.validators("http://example.org/"),
+            {"If-None-Match": '"abc"', "If-Modified-Since": "Mon, 01 Jan 2024"},
+        )
+        self.assertEqual(cache.get("http://example.org/"), b"body")
+
+    def test_without_validators_nothing_is_stored(self):
+        cache = ResponseCache(self.directory, 1024)
+        cache.store("http://example.org/", b"body", None, None)
+
+        self.assertEqual(cache.validators("http://example.org/"), {})
+        self.assertIsNone(cache.get("http://example.org/"))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.directory, 10)
+        cache.store("http://example.org/a", b"aaaa", '"a"', None)
+        cache.store("http://example.org/b", b"bbbb", '"b"', None)
+        cache.get("http://example.org/a")
+        cache.store("http://example.org/c", b"cccc", '"c"', None)
+
+        self.assertEqual(cache.get("http://example.org/a"), b"aaaa")
+        self.assertIsNone(cache.get("http://example.org/b"))
+        self.assertEqual(cache.get("http://example.org/c"), b"cccc")
+
+        # the removed page is not in the index on disk, even without save
+        cache = ResponseCache(self.directory, 10)
+        self.assertEqual(cache.validators("http://example.org/b"), {})
+
+    def test_missing_body_is_dropped(self):
+        cache = ResponseCache(self.directory, 1024)
+        cache.store("http://example.org/", b"body", '"abc"', None)
+        remove(path.join(self.directory, cache._key("http://example.org/")))
+
+        self.assertIsNone(cache.get("http://example.org/"))
+        self.assertEqual(cache.validators("http://example.org/"), {})
+
+
+class TestDescriptionCache(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_path = path.join(tmp.name, "descriptions.json")
+
+    def test_persistence(self):
+        cache = DescriptionCache(self.file_path, 60, 1024)
+        cache.store("http://example.org/a", "<p>A</p>")
+        cache.save()
+
+        cache = DescriptionCache(self.file_path, 60, 1024)
+        self.assertEqual(cache.get("http://example.org/a"), "<p>A</p>")
+
+    def test_ttl(self):
+        cache = DescriptionCache(self.file_path, 60, 1024)
+        cache.store("http://example.org/a", "<p>A</p>", now=1000)
+
+        self.assertEqual(cache.get("http://example.org/a", now=1060), "<p>A</p>")
+        self.assertIsNone(cache.get("http://example.org/a", now=1061))
+
+    def test_size_eviction(self):
+        cache = DescriptionCache(self.file_path, 60, 10)
+        cache.store("http://example.org/a", "aaaa")
+        cache.store("http://example.org/b", "bbbb")
+        cache.get("http://example.org/a")
+        cache.store("http://example.org/c", "cccc")
+
+        self.assertEqual(cache.get("http://example.org/a"), "aaaa")
+        self.assertIsNone(cache.get("http://example.org/b"))
+
+    def test_fetcher_downloads_only_unknown_links(self):
+        downloaded = []
+
+        class FakeDescriptionParser:
+            def __init__(self, url):
+                downloaded.append(url)
+                self.url = url
+
+            def getData(self):
+                return "description of " + self.url
+
+            def getErrors(self):
+                return []
+
+            def getStats(self):
+                return {}
+
+        DescriptionFetcher.description_cache = DescriptionCache(self.file_path, 60, 1024)
+        self.addCleanup(setattr, DescriptionFetcher, "description_cache", None)
+
+        fetcher = DescriptionFetcher(FakeDescriptionParser)
+        fetcher.fetch(["http://example.org/a"])
+        descriptions = fetcher.fetch(["http://example.org/a", "http://example.org/b"])
+
+        self.assertEqual(downloaded, ["http://example.org/a", "http://example.org/b"])
+        self.assertEqual(
+            descriptions,
+            ["description of http://example.org/a", "description of http://example.org/b"],
+        )
+
+    def test_incomplete_descriptions_are_not_stored(self):
+        class BrokenDescriptionParser:
+            def __init__(self, url):
+                pass
+
+            def getData(self):
+                return "<main><p>First paragraph"
+
+            def getErrors(self):
+                return [TimeoutError("timed out")]
+
+            def getStats(self):
+                return {}
+
+        DescriptionFetcher.description_cache = DescriptionCache(self.file_path, 60, 1024)
+        self.addCleanup(setattr, DescriptionFetcher, "description_cache", None)
+
+        fetcher = DescriptionFetcher(BrokenDescriptionParser)
+        self.assertEqual(
+            fetcher.fetch(["http://example.org/a"]), ["<main><p>First paragraph"]
+        )
+        self.assertIsNone(
+            DescriptionFetcher.description_cache.get("http://example.org/a")
+        )
+        self.assertEqual(fetcher.getStats()["description_errors"], 1)
+
+
+class TestFragmentCache(unittest.TestCase):
+    def test_size_eviction(self):
+        cache = FragmentCache(max_size=10)
+        cache.store(b"a", "aaaa")
+        cache.store(b"b", "bbbb")
+        cache.get(b"a")
+        cache.store(b"c", "cccc")
+        cache.store(b"d", "d" * 11)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(b"a"), "aaaa")
+        self.assertIsNone(cache.get(b"b"))
+        self.assertEqual(cache.get(b"c"), "cccc")
+        self.assertIsNone(cache.get(b"d"))
+
+
+class TestConditionalDownload(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, ConditionalHandler) + "/page"
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        GenericParser.response_cache = ResponseCache(tmp.name, 1024)
+        self.addCleanup(setattr, GenericParser, "response_cache", None)
+        ConditionalHandler.requests = []
+
+    def test_not_modified_reuses_cached_body(self):
+        first = GenericParser(self.url)._download_page()
+        second = GenericParser(self.url)._download_page()
+
+        self.assertEqual(first, "<p>cached page</p>")
+        self.assertEqual(second, first)
+        self.assertEqual(ConditionalHandler.requests[1]["If-None-Match"], '"v1"')
+
+    def test_not_modified_without_cached_body(self):
+        GenericParser(self.url)._download_page()
+        cache = GenericParser.response_cache
+        remove(path.join(cache._directory, cache._key(self.url)))
+
+        parser = GenericParser(self.url)
+        self.assertEqual(parser._download_page(), "<p>cached page</p>")
+        self.assertEqual(parser.getErrors(), [])
+        self.assertEqual(parser.getStats()["requests"], 2)
+        self.assertNotIn("If-None-Match", ConditionalHandler.requests[2])
@@ -0,0 +1,142 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from os import path
+from unittest.mock import patch
+
+from lib.daemon import Daemon
+from lib.item import Item
+
+
+class FakeParser:
+    fail = set()
+
+    def __init__(self, section):
+        self.section = section
+
+    def __str__(self):
+        return "Fake"
+
+    def getErrors(self):
+        return ["error"] if self.section in self.fail else []
+
+    def getStats(self):
+        return {"requests": 1, "bytes": 100, "status": 200}
+
+    def getData(self):
+        if self.section in self.fail:
+            return []
+
+        return [
+            Item(
+                "Title of %s" % self.section,
+                "http://example.org/%s" % self.section,
+                pubDate=datetime(2020, 1, 1),
+                source="http://example.org",
+            )
+        ]
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.feed_location = path.join(tmp.name, "feeds")
+        self.metrics_location = path.join(tmp.name, "metrics")
+
+        self.parsed = []
+
+        def choose_parser(runner, section):
+            self.parsed.append(section)
+            return FakeParser(section)
+
+        patcher = patch("lib.Parser2Feed.ParserRunner._choose_parser", choose_parser)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeParser.fail = set()
+
+        self.config = {
+            "GENERAL": {
+                "feed-location": self.feed_location,
+                "feed-title": "Test",
+                "feed-url": "http://example.org",
+                "feed-description": "Just for test purposes",
+                "interval": "10",
+                "interval-jitter": "0",
+                "max-backoff": "30",
+                "metrics-location": self.metrics_location,
+            },
+            "A": {"parser": "fake"},
+            "B": {"parser": "fake", "interval": "60"},
+        }
+
+    def test_sections_run_after_their_interval(self):
+        daemon = Daemon(self.config, ["one-feed-per-url"])
+
+        self.assertEqual(daemon.tick(now=0), 600)
+        self.assertEqual(self.parsed, ["A", "B"])
+
+        self.parsed.clear()
+        daemon.tick(now=600)
+        self.assertEqual(self.parsed, ["A"])
+
+    def test_failing_section_backs_off_and_keeps_entries(self):
+        daemon = Daemon(self.config, ["one-feed-per-url"])
+        daemon.tick(now=0)
+
+        FakeParser.fail = {"A"}
+        with patch("builtins.print"):
+            daemon.tick(now=600)
+            self.assertEqual(daemon._next_run["A"], 600 + 1200)
+
+            daemon.tick(now=1800)
+            self.assertEqual(daemon._next_run["A"], 1800 + 1800)
+
+        with open(path.join(self.feed_location, "feed-A.xml")) as f:
+            self.assertIn("Title of A", f.read())
+
+    def test_only_affected_feeds_are_rendered(self):
+        daemon = Daemon(self.config, ["one-feed-per-url"])
+        daemon.tick(now=0)
+
+        self.config["A"]["interval"] = "1"
+        daemon._next_run["A"] = 0
+        with patch(
+            "lib.Parser2Feed.AtomFeed.contentHash", return_value=""
+        ) as content_hash:
+            daemon.tick(now=10)
+
+        self.assertEqual(content_hash.call_count, 1)
+
+    def test_metrics_keep_sections_that_were_not_due(self):
+        daemon = Daemon(self.config, ["one-feed-per-url"])
+        daemon.tick(now=0)
+        daemon.tick(now=600)
+
+        with open(path.join(self.metrics_location, "metrics.json")) as f:
+            report = json.load(f)
+        self.assertEqual(sorted(report["sections"]), ["A", "B"])
+        self.assertEqual(
+            sorted(report["feeds"]),
+            [path.join(self.feed_location, "feed-%s.xml" % s) for s in "AB"],
+        )
+
+        with open(path.join(self.metrics_location, "html2rss.prom")) as f:
+            self.assertIn('html2rss_section_items{section="B"} 1', f.read())
+
+    def test_run_closes_item_store(self):
+        self.config["GENERAL"]["item-store"] = path.join(self.feed_location, "i.db")
+        daemon = Daemon(self.config, ["one-feed-per-url"])
+        item_store = daemon._runner._item_store
+
+        with patch.object(daemon, "tick", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                daemon.run()
+
+        self.assertIsNone(daemon._runner._item_store)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            item_store.items(["A"])
@@ -0,0 +1,41 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from lib import dates
+
+
+class TestDates(unittest.TestCase):
+    def test_parse_date(self):
+        expected = datetime(2024, 3, 1, 5, tzinfo=timezone.utc)
+
+        for text in (
+            "2024-03-01T05:00:00Z",
+            "2024-03-01T06:00:00+01:00",
+            " 2024-03-01T05:00:00.000Z ",
+            "2024/03/01  05:00:00+0000",
+            "2024/03/01 00:00:00-0500",
+        ):
+            with self.subTest(text=text):
+                date = dates.parse_date(text)
+                self.assertEqual(date, expected)
+                self.assertIs(date.tzinfo, timezone.utc)
+
+        self.assertEqual(
+            dates.parse_date("01.03.2024 05:00 +0000", "%d.%m.%Y %H:%M %z"), expected
+        )
+        with self.assertRaises(ValueError):
+            dates.parse_date("1. März 2024")
+
+    def test_naive_dates_are_local_time(self):
+        naive = datetime(2024, 3, 1, 5)
+        self.assertEqual(dates.to_utc(naive).timestamp(), naive.timestamp())
+        self.assertIs(dates.now().tzinfo, timezone.utc)
+
+    def test_format_rfc822(self):
+        date = datetime(2001, 11, 9, 2, 8, 47, tzinfo=timezone(timedelta(hours=1)))
+
+        self.assertEqual(dates.format_rfc822(date), "Fri, 09 Nov 2001 01:08:47 +0000")
+        self.assertEqual(
+            dates.format_rfc822(datetime(2024, 2, 29, 23, 59, 59, tzinfo=timezone.utc)),
+            "Thu, 29 Feb 2024 23:59:59 +0000",
+        )
@@ -0,0 +1,119 @@
+import gzip
+import http.client
+import tempfile
+import unittest
+from datetime import datetime
+from os import path
+from unittest.mock import patch
+
+from lib.atom_generator import AtomFeed
+from lib.feed_server import FeedPublisher, FeedServer
+from lib.Parser2Feed import OneRSSFile
+
+from .test_parser2feed import FakeParser
+
+
+class TestFeedServer(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.publisher = FeedPublisher()
+        server = FeedServer(self.publisher, "127.0.0.1", 0)
+        server.serve_in_background()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.port = server.server_address[1]
+
+        self.publish("Testarticle")
+
+    def publish(self, title):
+        feed = AtomFeed("Test", "http://example.org", "Just for test purposes")
+        feed.addItem(title, "http://example.org/article", "Description", datetime.now())
+        self.publisher.publish("feed.xml", feed)
+
+    def request(self, path="/feed.xml", method="GET", **headers):
+        connection = http.client.HTTPConnection("127.0.0.1", self.port)
+        self.addCleanup(connection.close)
+        connection.request(method, path, headers=headers)
+        response = connection.getresponse()
+        return response, response.read()
+
+    def test_feed_and_not_modified(self):
+        response, body = self.request()
+
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"<title>Testarticle</title>", body)
+        self.assertEqual(response.headers["Content-Length"], str(len(body)))
+        etag = response.headers["ETag"]
+
+        response, body = self.request(**{"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        self.publish("Changed article")
+        response, body = self.request(**{"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertIn(b"<title>Changed article</title>", body)
+
+    def test_gzip(self):
+        response, body = self.request(**{"Accept-Encoding": "br, gzip"})
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn(b"<title>Testarticle</title>", gzip.decompress(body))
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.endswith('-gzip"'))
+
+        response, _ = self.request(
+            **{"Accept-Encoding": "gzip", "If-None-Match": "W/" + etag}
+        )
+        self.assertEqual(response.status, 304)
+
+        response, _ = self.request(**{"Accept-Encoding": "gzip;q=0"})
+        self.assertIsNone(response.headers["Content-Encoding"])
+
+    def test_head_and_unknown_feed(self):
+        response, body = self.request(method="HEAD")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(body, b"")
+
+        response, _ = self.request("/other.xml")
+        self.assertEqual(response.status, 404)
+
+
+class TestPublishingHandler(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.feed_location = path.join(tmp.name, "feeds")
+
+        patcher = patch(
+            "lib.Parser2Feed.ParserRunner._choose_parser",
+            lambda runner, section: FakeParser(section),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_feeds_are_published_instead_of_written(self):
+        config = {
+            "GENERAL": {
+                "feed-location": self.feed_location,
+                "feed-title": "Test",
+                "feed-url": "http://example.org",
+                "feed-description": "Just for test purposes",
+            },
+            "A": {"parser": "fake"},
+        }
+        publisher = FeedPublisher()
+
+        OneRSSFile(config, publisher=publisher)
+        published = publisher.get("feed.xml")
+        self.assertIn(b"Title of A", published.body)
+        self.assertFalse(path.exists(path.join(self.feed_location, "feed.xml")))
+
+        # unchanged feeds keep their render and ETag
+        OneRSSFile(config, publisher=publisher)
+        self.assertIs(publisher.get("feed.xml"), published)
@@ -0,0 +1,96 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+from lib.fetch_registry import FetchRegistry
+from lib.Parser import DescriptionFetcher, DescriptionParser, GenericParser
+
+from .local_server import start_server
+from .test_generic_parser import ListParser
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+
+        time.sleep(0.2)
+        entries = "".join("<li>Eintrag %s</li>" % i for i in range(2000))
+        body = "<main><ul>%s</ul></main>" % entries
+        if self.path.startswith("/article"):
+            body += "<footer>%s</footer>" % ("<p>Footer</p>" * 10000)
+        body = body.encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFetchRegistry(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, CountingHandler) + "/"
+        CountingHandler.requests = []
+
+        patcher = patch.object(GenericParser, "fetch_registry", FetchRegistry())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_requests_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parsers = list(executor.map(DescriptionParser, [self.url + "page"] * 4))
+
+        self.assertEqual(CountingHandler.requests, ["/page"])
+        self.assertEqual(len({p.getData() for p in parsers}), 1)
+        self.assertIn("<li>Eintrag 1999</li>", parsers[0].getData())
+        self.assertEqual(
+            sorted(p.getStats()["shared_fetches"] for p in parsers), [0, 1, 1, 1]
+        )
+
+        DescriptionParser(self.url + "page")
+        self.assertEqual(CountingHandler.requests, ["/page"])
+
+    def test_errors_are_shared(self):
+        with patch("builtins.print"):
+            parsers = [DescriptionParser(self.url + "missing") for _ in range(2)]
+
+        self.assertEqual(CountingHandler.requests, ["/missing"])
+        self.assertTrue(all(p.getErrors() for p in parsers))
+
+    def test_early_stop_is_not_shared(self):
+        self.assertEqual(len(ListParser(self.url, max_items=1).getData()), 1)
+        self.assertEqual(len(ListParser(self.url).getData()), 2000)
+
+        self.assertEqual(CountingHandler.requests, ["/", "/"])
+
+    def test_early_stopped_descriptions_are_kept_for_the_run(self):
+        patcher = patch.object(DescriptionFetcher, "run_descriptions", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        links = [self.url + "article1", self.url + "article2"]
+        first = DescriptionFetcher(DescriptionParser).fetch(links)
+        second = DescriptionFetcher(DescriptionParser)
+        self.assertEqual(second.fetch(links[::-1]), first[::-1])
+
+        self.assertEqual(sorted(CountingHandler.requests), ["/article1", "/article2"])
+        self.assertEqual(second.getStats()["shared_fetches"], 2)
+        self.assertTrue(first[0].endswith("</ul></main>"))
+
+        # without it, the stopped download is repeated
+        DescriptionParser(links[0])
+        self.assertEqual(len(CountingHandler.requests), 3)
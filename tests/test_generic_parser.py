@@ -0,0 +1,166 @@
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from lib.Parser import DescriptionParser, GenericParser
+from lib.site_parsers import IdParser
+
+from .local_server import start_server
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        entries = "".join("<li>Eintrag Nr. %s – äöü</li>\n" % i for i in range(5000))
+        body = (
+            '<html><body><a id="link_archive" href="/archive/1"><img src="/1.png">'
+            "</a><ul>%s</ul></body></html>" % entries
+        ).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class ListParser(GenericParser):
+    def __init__(self, url, max_items=None):
+        super().__init__(url, max_items)
+
+        self._inside_entry = False
+        self._parse_URLs()
+
+    def handle_starttag(self, tag, attrs):
+        self._inside_entry = tag == "li"
+
+    def handle_data(self, data):
+        if self._inside_entry:
+            self._act_info.title += data
+
+    def handle_endtag(self, tag):
+        if tag == "li" and self._inside_entry:
+            self._inside_entry = False
+            self._next_url_info()
+
+
+class TestGenericParser(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, ListingHandler) + "/"
+
+    def test_streamed_page_is_parsed_completely(self):
+        elements = ListParser(self.url).getData()
+
+        self.assertEqual(len(elements), 5000)
+        self.assertEqual(elements[-1]["title"], "Eintrag Nr. 4999 – äöü")
+
+    def test_max_items(self):
+        elements = ListParser(self.url, max_items=3).getData()
+
+        self.assertEqual(
+            [e.title for e in elements],
+            ["Eintrag Nr. 0 – äöü", "Eintrag Nr. 1 – äöü", "Eintrag Nr. 2 – äöü"],
+        )
+
+    def test_id_parser_stops_after_first_link(self):
+        parser = IdParser(self.url)
+        elements = parser.getData()
+
+        self.assertEqual(len(elements), 1)
+        self.assertEqual(elements[0]["link"], self.url + "archive/1")
+        self.assertEqual(elements[0]["description"], '<img src="%s1.png" />' % self.url)
+        self.assertTrue(parser._done)
+
+    def test_parse_processes(self):
+        GenericParser.set_parse_processes(1)
+        self.addCleanup(GenericParser.set_parse_processes, 0)
+
+        parser = ListParser(self.url)
+        elements = parser.getData()
+
+        self.assertEqual(len(elements), 5000)
+        self.assertEqual(elements[0].title, "Eintrag Nr. 0 – äöü")
+        self.assertEqual(elements[-1].title, "Eintrag Nr. 4999 – äöü")
+        self.assertGreater(parser.getStats()["bytes"], 64 * 1024)
+
+        # small pages and early stops do not need the worker process
+        elements = ListParser(self.url, max_items=3).getData()
+        self.assertEqual(len(elements), 3)
+
+
+class ArticleHandler(BaseHTTPRequestHandler):
+    pages = {
+        "/article": (
+            "<html><head><script>var a = '<main>';</script></head><body>"
+            '<nav>Menu</nav><main><h1 class="title">Überschrift</h1>'
+            "<script>document.write('</main>')</script><style>p {}</style>"
+            "<p>Text &amp; mehr<br/><b>fett</p></main><footer>Footer</footer>"
+            "</body></html>"
+        ),
+        "/no-main": "<html><body><p>Nothing</p></body></html>",
+        "/long": "<main><div>%s</div></main>" % ("<p>Absatz</p>" * 10000),
+        "/huge": (
+            "<html><head><script>%s</script></head><body><main><p>Text</p>"
+            "</main><footer>%s</footer></body></html>"
+            % ("var a = 1;" * 10000, "<p>Footer</p>" * 300000)
+        ),
+    }
+
+    def do_GET(self):
+        body = self.pages[self.path].encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class TestDescriptionParser(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, ArticleHandler)
+
+    def test_main_without_scripts_and_styles(self):
+        description = DescriptionParser(self.url + "/article").getData()
+
+        self.assertEqual(
+            description,
+            '<main><h1 class="title">Überschrift</h1>'
+            "<p>Text &amp; mehr<br/><b>fett</b></p></main>",
+        )
+
+    def test_missing_main(self):
+        self.assertEqual(DescriptionParser(self.url + "/no-main").getData(), "")
+
+    def test_max_size(self):
+        DescriptionParser.max_size = 1000
+        self.addCleanup(setattr, DescriptionParser, "max_size", 512 * 1024)
+
+        description = DescriptionParser(self.url + "/long").getData()
+
+        self.assertLess(len(description), 1100)
+        self.assertTrue(description.startswith("<main><div><p>Absatz</p>"))
+        self.assertTrue(description.endswith("</div></main>"))
+
+    def test_parse_processes_stop_at_end_of_main(self):
+        GenericParser.set_parse_processes(1)
+        self.addCleanup(GenericParser.set_parse_processes, 0)
+
+        parser = DescriptionParser(self.url + "/huge")
+
+        self.assertEqual(parser.getData(), "<main><p>Text</p></main>")
+        page_size = len(ArticleHandler.pages["/huge"])
+        self.assertGreater(page_size, 3 * 1024 * 1024)
+        self.assertLess(parser.getStats()["bytes"], 1024 * 1024)
@@ -0,0 +1,199 @@
+import gzip
+import os
+import time
+import unittest
+import urllib.error
+import zlib
+from http.server import BaseHTTPRequestHandler
+from unittest.mock import patch
+
+from lib.http_client import HTTPClient
+
+from .local_server import start_server
+
+
+BODY = ("<p>Inhalt – %s</p>\n" * 2000).encode("utf-8")
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    headers_seen = []
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        self.headers_seen.append(dict(self.headers))
+
+        if self.path == "/slow":
+            time.sleep(1)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/plain")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = BODY
+        self.send_response(200)
+        if self.path == "/gzip":
+            body = gzip.compress(BODY)
+            self.send_header("Content-Encoding", "gzip")
+        elif self.path == "/deflate":
+            body = zlib.compress(BODY)
+            self.send_header("Content-Encoding", "deflate")
+        elif self.path == "/raw-deflate":
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            body = compressor.compress(BODY) + compressor.flush()
+            self.send_header("Content-Encoding", "deflate")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(
+            (self.command, self.path, self.headers.get("Proxy-Authorization"))
+        )
+
+        body = b"proxied"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_CONNECT(self):
+        self.requests.append(
+            (self.command, self.path, self.headers.get("Proxy-Authorization"))
+        )
+        self.send_error(403)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPClient(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, KeepAliveHandler)
+
+        KeepAliveHandler.connections = set()
+        KeepAliveHandler.headers_seen = []
+
+        self.client = HTTPClient()
+        self.addCleanup(self.client.close)
+
+    def get(self, path):
+        with self.client.open(self.url + path) as response:
+            return response.read(), response.bytes_received
+
+    def test_compressed_bodies(self):
+        for path in ("/plain", "/gzip", "/deflate", "/raw-deflate"):
+            with self.subTest(path=path):
+                body, received = self.get(path)
+                self.assertEqual(body, BODY)
+                if path != "/plain":
+                    self.assertLess(received, len(BODY))
+
+        self.assertEqual(
+            KeepAliveHandler.headers_seen[0]["Accept-Encoding"], "gzip, deflate"
+        )
+
+    def test_ssl_context_is_created_for_https_only(self):
+        with patch("lib.http_client.ssl.create_default_context") as create_context:
+            self.get("/plain")
+            self.assertFalse(create_context.called)
+
+            key = ("https", "example.org", 443, None)
+            self.client._get_connection(key)[0].close()
+            self.client._get_connection(key)[0].close()
+            create_context.assert_called_once_with()
+
+    def test_connection_is_reused(self):
+        for _ in range(5):
+            self.get("/gzip")
+
+        self.assertEqual(len(KeepAliveHandler.connections), 1)
+
+    def test_early_closed_response_is_not_reused(self):
+        with self.client.open(self.url + "/plain") as response:
+            response.read1(100)
+        self.get("/plain")
+
+        self.assertEqual(len(KeepAliveHandler.connections), 2)
+
+    def test_redirect(self):
+        with self.client.open(self.url + "/redirect") as response:
+            self.assertEqual(response.url, self.url + "/plain")
+            self.assertEqual(response.read(), BODY)
+
+    def test_errors(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.client.open(self.url + "/missing")
+        self.assertEqual(context.exception.code, 404)
+
+        with self.assertRaises(urllib.error.URLError):
+            self.client.open("ftp://example.org/")
+
+    def test_read_timeout(self):
+        self.client.read_timeout = 0.1
+
+        with self.assertRaises(urllib.error.URLError):
+            self.client.open(self.url + "/slow")
+
+
+class TestProxy(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.proxy_url = start_server(self, ProxyHandler)
+        ProxyHandler.requests = []
+
+        self.client = HTTPClient()
+        self.addCleanup(self.client.close)
+
+    def use_proxy(self, **environ):
+        patcher = patch.dict(os.environ, environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_http_is_sent_to_proxy(self):
+        proxy = self.proxy_url.replace("http://", "http://user:secret@")
+        self.use_proxy(http_proxy=proxy, no_proxy="")
+
+        with self.client.open("http://example.invalid/page?a=1") as response:
+            self.assertEqual(response.read(), b"proxied")
+
+        self.assertEqual(
+            ProxyHandler.requests,
+            [("GET", "http://example.invalid/page?a=1", "Basic dXNlcjpzZWNyZXQ=")],
+        )
+
+    def test_https_is_tunneled(self):
+        self.use_proxy(https_proxy=self.proxy_url, no_proxy="")
+
+        with self.assertRaises(urllib.error.URLError):
+            self.client.open("https://example.invalid/page")
+
+        self.assertEqual(
+            ProxyHandler.requests, [("CONNECT", "example.invalid:443", None)]
+        )
+
+    def test_no_proxy(self):
+        url = start_server(self, KeepAliveHandler)
+        self.use_proxy(http_proxy=self.proxy_url, no_proxy="127.0.0.1")
+
+        with self.client.open(url + "/plain") as response:
+            self.assertEqual(response.read(), BODY)
+        self.assertEqual(ProxyHandler.requests, [])
@@ -0,0 +1,27 @@
+import unittest
+from datetime import datetime
+
+from lib.item import Item
+
+
+class TestItem(unittest.TestCase):
+    def test_dict_access(self):
+        item = Item(source="http://example.org")
+        item["title"] = "Title"
+
+        self.assertEqual(item.title, "Title")
+        self.assertEqual(item["source"], "http://example.org")
+        self.assertIsNone(item["pubDate"])
+        self.assertEqual(item.get("missing", ""), "")
+        with self.assertRaises(KeyError):
+            item["missing"]
+
+    def test_no_instance_dict(self):
+        item = Item("Title", "http://example.org/a", "", datetime(2020, 1, 1))
+
+        with self.assertRaises(AttributeError):
+            item.other = 1
+        self.assertEqual(
+            dict((key, item[key]) for key in item.keys())["pubDate"],
+            datetime(2020, 1, 1),
+        )
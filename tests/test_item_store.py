@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from os import path
+
+from lib.item import Item
+from lib.item_store import ORDER_BY, ItemStore
+
+
+def item(number, day=None):
+    return Item(
+        "Title %s" % number,
+        "http://example.org/%s" % number,
+        "Description %s" % number,
+        datetime(2024, 3, day, tzinfo=timezone.utc) if day else None,
+        "http://example.org",
+    )
+
+
+class TestItemStore(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_path = path.join(tmp.name, "items.sqlite")
+
+    def store(self, **kwargs):
+        store = ItemStore(self.file_path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_merge_keeps_vanished_entries_and_updates_known_ones(self):
+        store = self.store()
+        store.merge("A", [item(1, 1), item(2, 2)], now=100)
+
+        changed = item(2, 2)
+        changed.title = "Changed title"
+        store.merge("A", [changed, item(3, 3)], now=200)
+
+        self.assertEqual(
+            [i.title for i in self.store().items(["A"])],
+            ["Title 3", "Changed title", "Title 1"],
+        )
+
+    def test_order_and_limit_over_several_sections(self):
+        store = self.store()
+        store.merge("A", [item(1, 1), item(2)], now=100)
+        store.merge("B", [item(3, 3)], now=100)
+        store.merge("C", [item(4, 4)], now=100)
+
+        items = store.items(["A", "B"])
+        self.assertEqual(
+            [i.link for i in items],
+            ["http://example.org/3", "http://example.org/1", "http://example.org/2"],
+        )
+        self.assertEqual(items[0], item(3, 3))
+        self.assertEqual(len(store.items(["A", "B"], max_items=2)), 2)
+
+    def test_retention_max_age(self):
+        day = 86400
+        store = self.store(max_age=10 * day)
+        first_run = datetime(2024, 3, 12, tzinfo=timezone.utc).timestamp()
+        store.merge("A", [item(1, 1), item(5, 5)], now=first_run)
+
+        # entry 1 vanished and is older than 10 days, entry 5 is not
+        store.merge("A", [item(9, 9)], now=first_run + day)
+        self.assertEqual([i.title for i in store.items(["A"])], ["Title 9", "Title 5"])
+
+    def test_retention_max_items(self):
+        store = self.store(max_items=2)
+        store.merge("A", [item(1, 1), item(2, 2)], now=100)
+        store.merge("A", [item(3, 3)], now=200)
+
+        self.assertEqual([i.title for i in store.items(["A"])], ["Title 3", "Title 2"])
+
+    def test_section_order_uses_index(self):
+        store = self.store()
+        plan = store._db.execute(
+            "EXPLAIN QUERY PLAN SELECT title FROM items WHERE section IN (?) "
+            "ORDER BY %s" % ORDER_BY,
+            ["A"],
+        ).fetchall()
+
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("items_by_section_date", details)
+        self.assertNotIn("TEMP B-TREE", details)
@@ -0,0 +1,66 @@
+import json
+import tempfile
+import unittest
+from os import path
+
+from lib.item import Item
+from lib.metrics import RunMetrics
+
+
+class FakeParser:
+    def __str__(self):
+        return "Fake"
+
+    def getData(self):
+        return [Item("Title", "http://example.org/a")]
+
+    def getErrors(self):
+        return []
+
+    def getStats(self):
+        return {
+            "requests": 3,
+            "bytes": 2048,
+            "status": 200,
+            "cache_hits": 1,
+            "description_cache_hits": 0,
+            "description_errors": 1,
+            "fetch_time": 0.25,
+        }
+
+
+class TestRunMetrics(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.metrics = RunMetrics()
+        self.metrics.record_section("Good", FakeParser(), 0.5)
+        self.metrics.record_section('Bad "one"', None, 0.1, ValueError("broken"))
+        self.metrics.record_feed("feeds/feed.xml", 0.01, 0.02, 1, True)
+
+    def test_report(self):
+        report = self.metrics.report()
+
+        self.assertEqual(report["sections"]["Good"]["bytes"], 2048)
+        self.assertEqual(report["sections"]["Good"]["items"], 1)
+        self.assertEqual(report["sections"]["Good"]["errors"], 1)
+        self.assertEqual(report["sections"]["Good"]["failed"], 0)
+        self.assertEqual(report["sections"]['Bad "one"']["error_messages"], ["broken"])
+        self.assertEqual(report["sections"]['Bad "one"']["failed"], 1)
+        self.assertEqual(report["feeds"]["feeds/feed.xml"]["written"], 1)
+
+    def test_prometheus(self):
+        text = self.metrics.prometheus()
+
+        self.assertIn('html2rss_section_downloaded_bytes{section="Good"} 2048\n', text)
+        self.assertIn('html2rss_section_failed{section="Bad \\"one\\""} 1\n', text)
+        self.assertIn('html2rss_feed_items{feed="feeds/feed.xml"} 1\n', text)
+        self.assertNotIn('html2rss_section_http_status{section="Bad', text)
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.metrics.write(directory)
+
+            with open(path.join(directory, "metrics.json")) as f:
+                self.assertIn("Good", json.load(f)["sections"])
+            self.assertTrue(path.exists(path.join(directory, "html2rss.prom")))
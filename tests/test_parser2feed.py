@@ -0,0 +1,149 @@
+import tempfile
+import unittest
+from datetime import datetime
+import os
+from os import path
+from unittest.mock import patch
+
+from lib.item import Item
+from lib.Parser2Feed import OneRSSFile, RSSFilePerParser, RSSFilePerURL
+
+
+class FakeParser:
+    def __init__(self, section):
+        if section == "Broken":
+            raise ValueError("parser broke")
+
+        self.section = section
+
+    def __str__(self):
+        return "Fake"
+
+    def getErrors(self):
+        return []
+
+    def getStats(self):
+        return {"requests": 1, "bytes": 100, "status": 200}
+
+    def getData(self):
+        return [
+            Item(
+                "Title of %s" % self.section,
+                "http://example.org/%s" % self.section,
+                pubDate=datetime(2020, 1, len(self.section)),
+                source="http://example.org",
+            )
+        ]
+
+
+class TestHandlers(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.feed_location = path.join(tmp.name, "feeds")
+
+        patcher = patch(
+            "lib.Parser2Feed.ParserRunner._choose_parser",
+            lambda runner, section: FakeParser(section),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def config(self, *sections):
+        config = {
+            "GENERAL": {
+                "feed-location": self.feed_location,
+                "feed-title": "Test",
+                "feed-url": "http://example.org",
+                "feed-description": "Just for test purposes",
+                "max-workers": "4",
+            }
+        }
+        for section in sections:
+            config[section] = {"parser": "fake"}
+        return config
+
+    def read_feed(self, name):
+        with open(path.join(self.feed_location, name)) as f:
+            return f.read()
+
+    def test_one_feed_for_all__skips_failing_section(self):
+        with patch("builtins.print"):
+            OneRSSFile(self.config("A", "Broken", "CCC"))
+
+        feed = self.read_feed("feed.xml")
+        self.assertIn("Title of A", feed)
+        self.assertIn("Title of CCC", feed)
+        self.assertNotIn("Broken", feed)
+
+    def test_one_feed_per_url(self):
+        RSSFilePerURL(self.config("A", "BB"))
+
+        self.assertIn("Title of A", self.read_feed("feed-A.xml"))
+        self.assertIn("Title of BB", self.read_feed("feed-BB.xml"))
+
+    def test_one_feed_per_parser(self):
+        RSSFilePerParser(self.config("A", "BB"))
+
+        feed = self.read_feed("feed-Fake.xml")
+        self.assertLess(feed.index("Title of BB"), feed.index("Title of A"))
+
+    def test_max_items_keeps_newest_entries(self):
+        config = self.config("A", "BB", "CCC")
+        config["GENERAL"]["max-items"] = "2"
+        OneRSSFile(config)
+
+        feed = self.read_feed("feed.xml")
+        self.assertLess(feed.index("Title of CCC"), feed.index("Title of BB"))
+        self.assertNotIn("Title of A", feed)
+
+    def test_unchanged_feed_is_not_rewritten(self):
+        RSSFilePerURL(self.config("A"))
+        feed_path = path.join(self.feed_location, "feed-A.xml")
+        os.utime(feed_path, (0, 0))
+
+        RSSFilePerURL(self.config("A"))
+        self.assertEqual(os.stat(feed_path).st_mtime, 0)
+
+        os.remove(feed_path)
+        RSSFilePerURL(self.config("A"))
+        self.assertTrue(path.exists(feed_path))
+        self.assertFalse(path.exists(feed_path + ".tmp"))
+
+    def test_parsers_are_shared_between_modes(self):
+        handler = OneRSSFile(self.config("A", "BB"))
+        RSSFilePerURL(self.config("A", "BB"), handler.parsers)
+
+        with patch(
+            "lib.Parser2Feed.ParserRunner._choose_parser"
+        ) as choose_parser:
+            RSSFilePerParser(self.config("A", "BB"), handler.parsers)
+            choose_parser.assert_not_called()
+
+        self.assertIn("Title of A", self.read_feed("feed.xml"))
+        self.assertIn("Title of BB", self.read_feed("feed-BB.xml"))
+        self.assertIn("Title of A", self.read_feed("feed-Fake.xml"))
+
+    def test_metrics_of_sections_and_feeds(self):
+        with patch("builtins.print"):
+            handler = OneRSSFile(self.config("A", "Broken"))
+
+        report = handler.metrics.report()
+        self.assertEqual(report["sections"]["A"]["items"], 1)
+        self.assertEqual(report["sections"]["A"]["bytes"], 100)
+        self.assertEqual(report["sections"]["Broken"]["failed"], 1)
+        feed = report["feeds"][path.join(self.feed_location, "feed.xml")]
+        self.assertEqual(feed["items"], 1)
+        self.assertEqual(feed["written"], 1)
+
+    def test_item_store_keeps_vanished_entries(self):
+        config = self.config("A")
+        config["GENERAL"]["item-store"] = path.join(self.feed_location, "items.sqlite")
+        RSSFilePerURL(config)
+
+        with patch.object(FakeParser, "getData", return_value=[]):
+            RSSFilePerURL(config)
+
+        self.assertIn("Title of A", self.read_feed("feed-A.xml"))
@@ -1,7 +1,19 @@
+import json
+import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler
+from os import path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
 
 from datetime import datetime
+from lib.cache import SeenIds
 from lib.Parser import *
+from lib.site_parsers import *
+
+from .local_server import start_server
 
 
 class TestParser(unittest.TestCase):
@@ -49,3 +61,138 @@ class TestParser(unittest.TestCase):
                 self.assertIsNotNone(e["link"])
                 self.assertIsInstance(e["pubDate"], datetime)
                 self.assertNotEqual(e["description"], "")
+
+
+class TestDescriptionFetcher(unittest.TestCase):
+    def test_order_and_host_limit(self):
+        lock = threading.Lock()
+        running = {"now": 0, "max": 0}
+
+        class FakeDescriptionParser:
+            def __init__(self, url):
+                with lock:
+                    running["now"] += 1
+                    running["max"] = max(running["max"], running["now"])
+                time.sleep(0.01)
+                with lock:
+                    running["now"] -= 1
+                self.url = url
+
+            def getData(self):
+                return "description of " + self.url
+
+            def getErrors(self):
+                return []
+
+            def getStats(self):
+                return {}
+
+        DescriptionFetcher.set_max_per_host(2)
+        self.addCleanup(DescriptionFetcher.set_max_per_host, 4)
+
+        links = ["http://example.org/%s" % i for i in range(10)]
+        descriptions = DescriptionFetcher(FakeDescriptionParser).fetch(links)
+
+        self.assertEqual(descriptions, ["description of " + l for l in links])
+        self.assertLessEqual(running["max"], 2)
+
+
+class FunkHandler(BaseHTTPRequestHandler):
+    """Channel with 25 videos, newest first."""
+
+    requested_pages = []
+    failing_pages = set()
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        page, size = int(query["page"][0]), int(query["size"][0])
+        self.requested_pages.append(page)
+        if page in self.failing_pages:
+            self.send_error(503)
+            return
+
+        videos = [
+            {
+                "title": "Video %s" % i,
+                "shortDescription": "Beschreibung %s" % i,
+                "alias": "video-%s" % i,
+                "channelAlias": "kanal",
+                "publicationDate": "2024-03-01T18:00:%02dZ" % i,
+            }
+            for i in range(24 - page * size, max(-1, 24 - (page + 1) * size), -1)
+        ]
+        body = json.dumps({"list": videos, "size": size, "page": page}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFunkPaging(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        base_url = start_server(self, FunkHandler)
+        FunkHandler.requested_pages = []
+        FunkHandler.failing_pages = set()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+
+        self.seen_ids = SeenIds(path.join(tmp.name, "seen.json"))
+        patcher = patch.multiple(
+            FunkParser,
+            api_url=base_url + "/{channel_id}/videos?page={page}&size={size}",
+            seen_ids=self.seen_ids,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pages_until_last_page(self):
+        # page 0 alone, then the pages 1 and 2 at once
+        with patch.object(DescriptionFetcher, "max_per_host", 2):
+            elements = FunkParser("kanal", max_pages=10, page_size=10).getData()
+
+        self.assertEqual(len(elements), 25)
+        self.assertEqual(elements[0].title, "Video 24")
+        self.assertEqual(elements[-1].title, "Video 0")
+        self.assertEqual(sorted(FunkHandler.requested_pages), [0, 1, 2])
+
+    def test_stops_at_known_videos(self):
+        FunkParser("kanal", max_pages=5, page_size=10)
+        FunkHandler.requested_pages = []
+
+        elements = FunkParser("kanal", max_pages=5, page_size=10).getData()
+
+        self.assertEqual(len(elements), 10)
+        self.assertEqual(FunkHandler.requested_pages, [0])
+
+    def test_max_pages_and_max_items(self):
+        elements = FunkParser("kanal", max_pages=2, page_size=5).getData()
+        self.assertEqual(len(elements), 10)
+
+        elements = FunkParser("other", max_items=3, max_pages=5).getData()
+        self.assertEqual(len(elements), 3)
+
+    def test_failed_page_keeps_pages_before(self):
+        FunkHandler.failing_pages = {2}
+        with patch.object(DescriptionFetcher, "max_per_host", 3):
+            with patch("builtins.print"):
+                parser = FunkParser("kanal", max_pages=10, page_size=5)
+
+        self.assertEqual(len(parser.getData()), 10)
+        self.assertEqual(parser.getData()[-1].title, "Video 15")
+        self.assertEqual(len(parser.getErrors()), 1)
+        self.assertEqual(sorted(FunkHandler.requested_pages), [0, 1, 2, 3])
+
+    def test_single_page_after_mostly_known_videos(self):
+        self.seen_ids.add("funk/kanal", ["video-%s" % i for i in range(24)])
+
+        elements = FunkParser("kanal", max_pages=5, page_size=10).getData()
+
+        self.assertEqual(len(elements), 20)
+        self.assertEqual(FunkHandler.requested_pages, [0, 1])
@@ -0,0 +1,120 @@
+import subprocess
+import sys
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from lib.Parser2Feed import NoParserError, ParserRunner
+from lib.registry import ENTRY_POINT_GROUP, ParserRegistry
+
+
+class FakeParser:
+    def __init__(self, url, max_items=None):
+        self.url = url
+        self.max_items = max_items
+
+    @classmethod
+    def from_config(cls, options, max_items=None):
+        return cls(options["source-url"], max_items)
+
+
+class FakeEntryPoint:
+    def __init__(self, name):
+        self.name = name
+        self.loaded = False
+
+    def load(self):
+        self.loaded = True
+        return FakeParser
+
+
+class TestParserRegistry(unittest.TestCase):
+    def test_builtin_parsers_are_imported_lazily(self):
+        code = (
+            "import sys\n"
+            "from lib.Parser2Feed import ParserRunner\n"
+            "from lib.registry import registry\n"
+            "for module in ('lib.selector_parser', 'lib.site_parsers',\n"
+            "               'importlib.metadata', 'multiprocessing'):\n"
+            "    assert module not in sys.modules, module\n"
+            "registry.get('selector')\n"
+            "assert 'lib.selector_parser' in sys.modules\n"
+            "assert 'lib.site_parsers' not in sys.modules\n"
+            "registry.get('funk')\n"
+            "assert 'lib.site_parsers' in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_register(self):
+        registry = ParserRegistry(entry_points=False)
+        registry.register("fake", FakeParser)
+        registry.register("fake-path", "tests.test_registry:FakeParser")
+
+        self.assertIs(registry.get("fake"), FakeParser)
+        self.assertIs(registry.get("fake-path"), FakeParser)
+        with self.assertRaises(KeyError):
+            registry.get("unknown")
+
+    def test_entry_points(self):
+        entry_point = FakeEntryPoint("plugin")
+        with patch(
+            "importlib.metadata.entry_points", return_value=[entry_point]
+        ) as entry_points:
+            registry = ParserRegistry()
+            self.assertFalse(entry_points.called)
+
+            self.assertEqual(registry.get("soundcloud").__name__, "SoundcloudParser")
+            self.assertFalse(entry_points.called)
+
+            self.assertIs(registry.get("plugin"), FakeParser)
+            self.assertIs(registry.get("plugin"), FakeParser)
+
+        entry_points.assert_called_once_with(group=ENTRY_POINT_GROUP)
+        self.assertTrue(entry_point.loaded)
+
+    def test_concurrent_entry_point_lookup(self):
+        def slow_entry_points(group):
+            time.sleep(0.1)
+            return [FakeEntryPoint("plugin")]
+
+        registry = ParserRegistry()
+        with patch("importlib.metadata.entry_points", slow_entry_points):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                parsers = list(executor.map(registry.get, ["plugin"] * 4))
+
+        self.assertEqual(parsers, [FakeParser] * 4)
+
+
+class TestChooseParser(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        registry = ParserRegistry(entry_points=False)
+        registry.register("fake", FakeParser)
+        patcher = patch("lib.Parser2Feed.registry", registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.runner = ParserRunner(
+            {
+                "GENERAL": {},
+                "Fake": {
+                    "parser": "fake",
+                    "source-url": "http://example.org",
+                    "max-items": "5",
+                },
+                "Unknown": {"parser": "twitter", "source-url": "http://example.org"},
+            }
+        )
+
+    def test_choose_parser(self):
+        parser = self.runner._choose_parser("Fake")
+
+        self.assertIsInstance(parser, FakeParser)
+        self.assertEqual(parser.url, "http://example.org")
+        self.assertEqual(parser.max_items, 5)
+
+    def test_unknown_parser(self):
+        with self.assertRaises(NoParserError):
+            self.runner._choose_parser("Unknown")
@@ -0,0 +1,135 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from os import path
+from unittest.mock import patch
+
+from lib.cache import DescriptionCache
+from lib.item import Item
+from lib.Parser2Feed import ParserRunner
+from lib.section_state import SectionState, StoredParser
+
+
+class FakeParser:
+    broken = False
+
+    def __str__(self):
+        return "Fake"
+
+    def getData(self):
+        return [
+            Item(
+                "Title",
+                "http://example.org/a",
+                pubDate=datetime(2024, 3, 1, 12, tzinfo=timezone.utc),
+            )
+        ]
+
+    def getErrors(self):
+        return []
+
+    def getStats(self):
+        return {}
+
+
+class TestSectionState(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.file_path = path.join(tmp.name, "sections.json")
+
+    def test_last_parser_is_persisted(self):
+        state = SectionState(self.file_path, 3, 60)
+        state.record_success("A", FakeParser())
+        state.save()
+
+        parser = SectionState(self.file_path, 3, 60).last_parser("A")
+        self.assertEqual(str(parser), "Fake")
+        self.assertEqual(parser.getData(), FakeParser().getData())
+
+    def test_descriptions_are_not_stored(self):
+        cache = DescriptionCache(path.join(self.directory, "d.json"), 60, 1024**2)
+        items = [
+            Item("Cached", "http://example.org/a", "<p>%s</p>" % ("a" * 10000)),
+            Item("Long", "http://example.org/b", "<p>%s</p>" % ("b" * 10000)),
+            Item("Short", "http://example.org/c", "<p>c</p>"),
+        ]
+        cache.store(items[0].link, items[0].description)
+        parser = StoredParser("Fake", items)
+
+        state = SectionState(self.file_path, 3, 60, cache)
+        state.record_success("A", parser)
+        state.save()
+        self.assertLess(path.getsize(self.file_path), 1000)
+
+        stored = SectionState(self.file_path, 3, 60, cache).last_parser("A")
+        self.assertEqual(
+            [item.description for item in stored.getData()],
+            [items[0].description, "", "<p>c</p>"],
+        )
+
+    def test_circuit_breaker(self):
+        state = SectionState(self.file_path, 2, 60)
+
+        state.record_failure("A", now=1000)
+        self.assertFalse(state.is_open("A", now=1001))
+
+        state.record_failure("A", now=1000)
+        self.assertTrue(state.is_open("A", now=1059))
+        self.assertFalse(state.is_open("A", now=1061))
+
+        state.record_success("A", FakeParser())
+        state.record_failure("A", now=2000)
+        self.assertFalse(state.is_open("A", now=2001))
+
+    def test_runner_keeps_entries_of_broken_section(self):
+        def choose_parser(runner, section):
+            if FakeParser.broken:
+                raise ValueError("broken")
+            return FakeParser()
+
+        config = {
+            "GENERAL": {
+                "cache-location": self.directory,
+                "circuit-breaker-failures": "1",
+            },
+            "A": {"parser": "fake"},
+        }
+
+        with patch("lib.Parser2Feed.ParserRunner._choose_parser", choose_parser):
+            ParserRunner(config).run(["A"])
+
+            FakeParser.broken = True
+            self.addCleanup(setattr, FakeParser, "broken", False)
+            with patch("builtins.print") as print_mock:
+                parsers, failed = ParserRunner(config).run(["A"])
+                self.assertEqual(failed, {"A"})
+                self.assertEqual(parsers["A"].getData(), FakeParser().getData())
+
+                parsers, failed = ParserRunner(config).run(["A"])
+                print_mock.assert_called_with(
+                    SectionSkippedMatcher("failed too often"), "on", "A"
+                )
+                self.assertEqual(parsers["A"].getData(), FakeParser().getData())
+
+    def test_run_deadline(self):
+        config = {"GENERAL": {"run-deadline": "0.001"}, "A": {"parser": "fake"}}
+        runner = ParserRunner(config)
+
+        with patch("lib.Parser2Feed.time.monotonic", side_effect=[0, 1]):
+            with patch("builtins.print"):
+                parsers, failed = runner.run(["A"])
+
+        self.assertEqual(parsers, {})
+        self.assertEqual(failed, {"A"})
+
+
+class SectionSkippedMatcher:
+    def __init__(self, message):
+        self.message = message
+
+    def __eq__(self, other):
+        return self.message in str(other)
@@ -0,0 +1,140 @@
+import unittest
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+
+from lib.Parser import MissingOptionError
+from lib.Parser2Feed import ParserRunner
+from lib.selector_parser import Rule, SelectorError, SelectorParser
+
+from .local_server import start_server
+
+
+PAGE = """<html><body>
+<nav><a href="/">Home</a></nav>
+<div class="list">
+<article class="teaser news" data-type="news">
+  <a href="/article/1"><h3>First <b>article</b></h3></a>
+  <time datetime="2024-03-01T06:00:00Z">1. März</time>
+  <img src="/1.png" alt="Bild">
+  <p class="summary">Summary
+     of the first article</p>
+  <p class="summary">Ignored second summary</p>
+</article>
+<article class="teaser">
+  <h3>Second article</h3>
+  <a href="http://example.org/article/2">more</a>
+  <time datetime="2024-02-29T06:00:00+01:00">29. Februar</time>
+</article>
+<article class="teaser"><h3>Teaser without link</h3></article>
+<article class="other"><h3>Not an entry</h3></article>
+</div>
+</body></html>"""
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = PAGE.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRule(unittest.TestCase):
+    def test_compound_selector(self):
+        rule = Rule("link", 'a.teaser#first[data-type="news"][href]@href')
+
+        self.assertEqual(rule.tag, "a")
+        self.assertEqual(rule.classes, {"teaser"})
+        self.assertEqual(rule.id, "first")
+        self.assertEqual(rule.attrs, [("data-type", "news"), ("href", None)])
+        self.assertEqual(rule.attribute, "href")
+        self.assertTrue(
+            rule.matches(
+                {"class": "big teaser", "id": "first", "data-type": "news", "href": ""}
+            )
+        )
+        self.assertFalse(rule.matches({"class": "teaser", "id": "first", "href": ""}))
+
+    def test_invalid_selectors(self):
+        for selector in ("", "a b", "a..b", "[unclosed"):
+            with self.subTest(selector=selector):
+                with self.assertRaises(SelectorError):
+                    Rule("title", selector)
+
+
+class TestSelectorParser(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.url = start_server(self, PageHandler) + "/list"
+
+        self.options = {
+            "item-selector": "article.teaser",
+            "title-selector": "h3",
+            "link-selector": "a@href",
+            "date-selector": "time@datetime",
+            "description-selector": "p.summary, img@alt",
+        }
+
+    def test_entries(self):
+        elements = SelectorParser(self.url, self.options).getData()
+
+        self.assertEqual(len(elements), 2)
+        self.assertEqual(elements[0].title, "First article")
+        self.assertEqual(elements[0].link, self.url.replace("/list", "/article/1"))
+        self.assertEqual(
+            elements[0].pubDate, datetime(2024, 3, 1, 6, tzinfo=timezone.utc)
+        )
+        self.assertEqual(elements[0].description, "Bild")
+        self.assertEqual(elements[1].title, "Second article")
+        self.assertEqual(elements[1].link, "http://example.org/article/2")
+        self.assertEqual(elements[1].description, "")
+
+    def test_entries_without_link_are_left_out(self):
+        elements = SelectorParser(self.url, self.options).getData()
+        self.assertNotIn("Teaser without link", [e.title for e in elements])
+
+        del self.options["link-selector"]
+        with self.assertRaises(MissingOptionError) as context:
+            SelectorParser(self.url, self.options)
+        self.assertEqual(context.exception.option, "link-selector")
+
+    def test_missing_option_is_a_config_error(self):
+        config = {
+            "GENERAL": {},
+            "News": {
+                "parser": "selector",
+                "source-url": self.url,
+                "item-selector": "article.teaser",
+            },
+        }
+
+        with self.assertRaises(MissingOptionError) as context:
+            ParserRunner(config).run(["News"])
+        self.assertIn('"News"', str(context.exception))
+        self.assertIn('"link-selector"', str(context.exception))
+
+    def test_text_description_and_max_items(self):
+        self.options["description-selector"] = ".summary"
+        elements = SelectorParser(self.url, self.options, max_items=1).getData()
+
+        self.assertEqual(len(elements), 1)
+        self.assertEqual(elements[0].description, "Summary of the first article")
+
+    def test_date_format(self):
+        self.options["date-format"] = "%Y-%m-%dT%H:%M:%S%z"
+        elements = SelectorParser(self.url, self.options).getData()
+
+        self.assertEqual(
+            elements[1].pubDate, datetime(2024, 2, 29, 5, tzinfo=timezone.utc)
+        )
+
+        self.options["date-selector"] = "time"
+        elements = SelectorParser(self.url, self.options).getData()
+
+        # dates that do not match the format are left out
+        self.assertIsNone(elements[0].pubDate)